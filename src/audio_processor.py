@@ -3,53 +3,150 @@ Audio processing module for audiobook generation.
 Handles audio manipulation, concatenation, and format conversion.
 """
 
+import io
 import logging
 import os
-import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import av
+import numpy as np
+from mutagen.easyid3 import EasyID3  # type: ignore
+from mutagen.id3 import ID3NoHeaderError  # type: ignore
+from mutagen.mp3 import MP3  # type: ignore
 from pydub import AudioSegment  # type: ignore
 
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# NumPy sample types for the PCM sample widths handled without pydub
+_SAMPLE_DTYPES: Dict[int, Any] = {2: np.int16, 4: np.int32}
+
+# Samples per block when normalizing, bounding the float working copy for whole-book audio
+_NORMALIZE_BLOCK = 1 << 20
+
+# PyAV frame formats and channel layouts for in-process MP3 encoding
+_AV_SAMPLE_FORMATS = {2: "s16", 4: "s32"}
+_AV_LAYOUTS = {1: "mono", 2: "stereo"}
+
+# MPEG Layer III bitrates (kbps) by version group and sample rates (Hz) by version bits, for frame header parsing
+_MP3_BITRATES = {
+    True: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    False: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+# Linear fade gain ramps keyed by (frame count, rising), shared by all processors
+_FADE_CACHE: Dict[Tuple[int, bool], np.ndarray] = {}
+
 
 class AudioProcessor:
     """Handles audio processing and manipulation for audiobook generation."""
 
     def __init__(self) -> None:
         """Initialize audio processor."""
-        self.temp_dir = tempfile.mkdtemp()
-        logger.info(f"Audio processor initialized with temp dir: {self.temp_dir}")
+        self._silence_cache: Dict[Tuple[int, int, int], bytes] = {}
+        self._silence_mp3_cache: Dict[Tuple[int, int, int, int], bytes] = {}
+        self._pipeline: Optional[ThreadPoolExecutor] = None
+        self._pipeline_futures: Dict[Future, int] = {}
+        logger.info("Audio processor initialized")
 
-    def bytes_to_audio_segment(self, audio_bytes: bytes) -> AudioSegment:
+    def bytes_to_audio_segment(self, audio_bytes: bytes, audio_format: str = "mp3") -> AudioSegment:
         """Convert audio bytes to AudioSegment."""
-        # Save bytes to temporary file
-        temp_file = os.path.join(self.temp_dir, f"temp_{os.getpid()}.mp3")
-        with open(temp_file, "wb") as f:
-            f.write(audio_bytes)
-
-        # Load as AudioSegment
-        audio = AudioSegment.from_mp3(temp_file)
-
-        # Clean up
-        os.remove(temp_file)
-
-        return audio
+        return AudioSegment.from_file(io.BytesIO(audio_bytes), format=audio_format)
 
     def add_silence(self, duration_ms: int) -> AudioSegment:
         """Create silence of specified duration."""
         return AudioSegment.silent(duration=duration_ms)
 
+    def _silence_bytes(self, duration_ms: int, frame_rate: int, frame_width: int) -> bytes:
+        """Raw PCM silence, shared between every pause of the same length and format."""
+        key = (duration_ms, frame_rate, frame_width)
+        if key not in self._silence_cache:
+            frames = int(frame_rate * duration_ms / 1000.0)
+            self._silence_cache[key] = b"\x00" * (frames * frame_width)
+        return self._silence_cache[key]
+
+    def _silence_mp3(self, duration_ms: int, frame_rate: int, channels: int, bitrate: int) -> bytes:
+        """Get bare MP3 frames (no ID3 or Xing header) of silence, cached by duration and format."""
+        key = (duration_ms, frame_rate, channels, bitrate)
+        if key not in self._silence_mp3_cache:
+            codec = av.CodecContext.create("libmp3lame", "w")
+            codec.sample_rate = frame_rate
+            codec.layout = _AV_LAYOUTS[channels]
+            codec.format = "s16p"
+            codec.bit_rate = bitrate
+
+            samples = np.zeros((1, frame_rate * duration_ms // 1000 * channels), dtype=np.int16)
+            frame = av.AudioFrame.from_ndarray(samples, format="s16", layout=_AV_LAYOUTS[channels])
+            frame.sample_rate = frame_rate
+
+            packets = [*codec.encode(frame), *codec.encode(None)]
+            self._silence_mp3_cache[key] = b"".join(bytes(packet) for packet in packets)
+        return self._silence_mp3_cache[key]
+
     def normalize_audio(self, audio: AudioSegment, target_dBFS: float = -20.0) -> AudioSegment:
         """Normalize audio to target dBFS level."""
-        change_in_dBFS = target_dBFS - audio.dBFS
-        return audio.apply_gain(change_in_dBFS)
+        dtype = _SAMPLE_DTYPES.get(audio.sample_width)
+        if dtype is None:
+            change_in_dBFS = target_dBFS - audio.dBFS
+            return audio.apply_gain(change_in_dBFS)
+
+        samples = np.frombuffer(audio.raw_data, dtype=dtype)
+        if not samples.size:
+            return audio
+
+        # Whole books run to gigabytes of PCM, so the RMS is accumulated block by block
+        # instead of squaring a float copy of every sample at once
+        sum_squares = 0.0
+        for start in range(0, samples.size, _NORMALIZE_BLOCK):
+            block = samples[start : start + _NORMALIZE_BLOCK].astype(np.float64)
+            sum_squares += float(np.dot(block, block))
+
+        rms = (sum_squares / samples.size) ** 0.5
+        if rms == 0:
+            return audio  # Pure silence has no level to normalize
+
+        current_dBFS = 20 * np.log10(rms / audio.max_possible_amplitude)
+        work_dtype = np.float32 if audio.sample_width == 2 else np.float64
+        gain = work_dtype(10 ** ((target_dBFS - current_dBFS) / 20))
+
+        # Scale one output copy in place, a block at a time
+        limits = np.iinfo(dtype)
+        data = bytearray(audio.raw_data)
+        out = np.frombuffer(data, dtype=dtype)
+        for start in range(0, out.size, _NORMALIZE_BLOCK):
+            block = out[start : start + _NORMALIZE_BLOCK]
+            scaled = np.multiply(block, gain, dtype=work_dtype)
+            np.clip(scaled, limits.min, limits.max, out=scaled)
+            block[:] = scaled
+        return audio._spawn(data)
 
     def add_fade(self, audio: AudioSegment, fade_in_ms: int = 500, fade_out_ms: int = 500) -> AudioSegment:
         """Add fade in/out to audio."""
-        return audio.fade_in(fade_in_ms).fade_out(fade_out_ms)
+        dtype = _SAMPLE_DTYPES.get(audio.sample_width)
+        head_frames = int(audio.frame_rate * fade_in_ms / 1000.0)
+        tail_frames = int(audio.frame_rate * fade_out_ms / 1000.0)
+        if dtype is None or head_frames + tail_frames > audio.frame_count():
+            return audio.fade_in(fade_in_ms).fade_out(fade_out_ms)
+
+        # Only the head and tail change; the middle is copied once into the joined result
+        raw = memoryview(audio.raw_data)
+        head_end = head_frames * audio.frame_width
+        tail_start = len(raw) - tail_frames * audio.frame_width
+
+        head = self._apply_ramp(raw[:head_end], dtype, audio.channels, rising=True)
+        tail = self._apply_ramp(raw[tail_start:], dtype, audio.channels, rising=False)
+        return audio._spawn(b"".join([head, raw[head_end:tail_start], tail]))
+
+    def _apply_ramp(self, data: memoryview, dtype: Any, channels: int, rising: bool) -> bytes:
+        """Scale raw PCM samples by a linear gain ramp."""
+        samples = np.frombuffer(data, dtype=dtype).reshape(-1, channels)
+        ramp = _get_fade_ramp(len(samples), rising)
+        scaled: np.ndarray = (samples * ramp[:, np.newaxis]).astype(dtype)
+        return scaled.tobytes()
 
     def concatenate_audio_segments(self, audio_segments: List[AudioSegment], add_pauses: bool = True) -> AudioSegment:
         """
@@ -65,23 +162,127 @@ class AudioProcessor:
         if not audio_segments:
             return AudioSegment.silent(duration=1000)
 
-        result = audio_segments[0]
+        pause_ms = Config.PAUSE_BETWEEN_SENTENCES if add_pauses else 0
+        return self._join_segments(audio_segments, [pause_ms] * (len(audio_segments) - 1))
+
+    def _match_format(self, audio_segments: List[AudioSegment]) -> List[AudioSegment]:
+        """Convert segments to a common frame rate, channel count and sample width."""
+        frame_rate = max(segment.frame_rate for segment in audio_segments)
+        channels = max(segment.channels for segment in audio_segments)
+        sample_width = max(segment.sample_width for segment in audio_segments)
 
-        for i in range(1, len(audio_segments)):
-            if add_pauses:
-                pause_duration = Config.PAUSE_BETWEEN_SENTENCES
-                result += self.add_silence(pause_duration)
+        matched = []
+        for segment in audio_segments:
+            if (segment.frame_rate, segment.channels, segment.sample_width) != (frame_rate, channels, sample_width):
+                segment = segment.set_frame_rate(frame_rate).set_channels(channels).set_sample_width(sample_width)
+            matched.append(segment)
 
-            result += audio_segments[i]
+        return matched
+
+    def _join_segments(self, audio_segments: List[AudioSegment], pauses_ms: List[int]) -> AudioSegment:
+        """
+        Join segments with a single allocation instead of repeated AudioSegment additions.
 
-        return result
+        Args:
+            audio_segments: Non-empty list of AudioSegment objects
+            pauses_ms: Silence to insert before each segment after the first
+
+        Returns:
+            Joined AudioSegment
+        """
+        segments = self._match_format(audio_segments)
+        first = segments[0]
+
+        chunks = [first.raw_data]
+        for segment, pause_ms in zip(segments[1:], pauses_ms):
+            if pause_ms > 0:
+                chunks.append(self._silence_bytes(pause_ms, first.frame_rate, first.frame_width))
+            chunks.append(segment.raw_data)
+
+        return first._spawn(b"".join(chunks))
+
+    def _decode_segment(self, index: int, audio_bytes: bytes) -> Optional[AudioSegment]:
+        """Decode one segment, returning None if it is empty or cannot be decoded."""
+        if not audio_bytes:  # Skip empty bytes
+            return None
+
+        try:
+            return self.bytes_to_audio_segment(audio_bytes)
+        except Exception as e:
+            logger.warning(f"Failed to process audio segment {index}: {e}")
+            return None
+
+    def decode_segments(self, audio_bytes_list: List[bytes]) -> List[Optional[AudioSegment]]:
+        """
+        Decode a list of audio bytes.
+
+        Args:
+            audio_bytes_list: List of audio content as bytes
+
+        Returns:
+            Decoded segments in input order, None where a segment is empty or could not be decoded
+        """
+        # Each decode waits on an ffmpeg subprocess, so run them in parallel
+        with ThreadPoolExecutor(max_workers=Config.MAX_DECODE_WORKERS) as executor:
+            return list(executor.map(self._decode_segment, range(len(audio_bytes_list)), audio_bytes_list))
+
+    def start_pipeline(self, n_workers: Optional[int] = None) -> None:
+        """
+        Start worker threads that decode segments while synthesis is still running.
+
+        Each decode waits on an ffmpeg subprocess, so threads overlap them without forking
+        a process that would inherit the gRPC and logging threads.
+
+        Args:
+            n_workers: Number of worker threads, defaults to Config.MAX_DECODE_WORKERS
+        """
+        if self._pipeline is None:
+            self._pipeline = ThreadPoolExecutor(max_workers=n_workers or Config.MAX_DECODE_WORKERS)
+            logger.info("Audio decode pipeline started")
+        self._pipeline_futures = {}
+
+    def submit_segment(self, index: int, audio_bytes: bytes) -> None:
+        """
+        Queue one synthesized segment for decoding in the pipeline.
+
+        Args:
+            index: Position of the segment in the audiobook
+            audio_bytes: Audio content as bytes
+        """
+        if self._pipeline is None:
+            self.start_pipeline()
+        assert self._pipeline is not None
+        future = self._pipeline.submit(self._decode_segment, index, audio_bytes)
+        self._pipeline_futures[future] = index
+
+    def collect_pipeline(self, count: int) -> List[Optional[AudioSegment]]:
+        """
+        Wait for the queued segments and return them decoded.
+
+        Args:
+            count: Total number of segments submitted
+
+        Returns:
+            Decoded segments in index order, None where a segment is missing, empty or could not be decoded
+        """
+        decoded_segments: List[Optional[AudioSegment]] = [None] * count
+
+        for future in as_completed(self._pipeline_futures):
+            index = self._pipeline_futures[future]
+            if index < count:
+                decoded_segments[index] = future.result()  # _decode_segment logs failures and returns None
+
+        self._pipeline_futures = {}
+        return decoded_segments
 
     def create_audiobook_from_bytes(
         self,
         audio_bytes_list: List[bytes],
         segments_info: Optional[List[Dict]] = None,
         output_filename: str = "audiobook.mp3",
-    ) -> Optional[str]:
+        metadata: Optional[Dict[str, Any]] = None,
+        decoded_segments: Optional[List[Optional[AudioSegment]]] = None,
+    ) -> Optional[Path]:
         """
         Create an audiobook from a list of audio bytes.
 
@@ -89,54 +290,78 @@ class AudioProcessor:
             audio_bytes_list: List of audio content as bytes
             segments_info: Optional metadata for segments
             output_filename: Output filename
+            metadata: Optional ID3 tags written during export
+            decoded_segments: Segments already decoded by the pipeline, skips decoding audio_bytes_list
 
         Returns:
             Path to the generated audiobook
         """
         logger.info(f"Creating audiobook from {len(audio_bytes_list)} segments")
 
-        # Convert bytes to AudioSegments
-        audio_segments = []
-        for i, audio_bytes in enumerate(audio_bytes_list):
-            if audio_bytes:  # Skip empty bytes
-                try:
-                    segment = self.bytes_to_audio_segment(audio_bytes)
-                    segment = self.normalize_audio(segment)
-                    audio_segments.append(segment)
-                except Exception as e:
-                    logger.warning(f"Failed to process audio segment {i}: {e}")
+        if decoded_segments is None:
+            decoded_segments = self.decode_segments(audio_bytes_list)
 
-        if not audio_segments:
-            logger.error("No valid audio segments found")
-            return None
+        return self._assemble(decoded_segments, segments_info, output_filename, metadata)
 
-        # Add chapter breaks if segment info is provided
-        final_segments = []
+    def _assemble(
+        self,
+        decoded_segments: List[Optional[AudioSegment]],
+        segments_info: Optional[List[Dict]],
+        output_filename: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Path]:
+        """
+        Join decoded segments into an audiobook file.
+
+        Args:
+            decoded_segments: Output of decode_segments
+            segments_info: Optional metadata, aligned with decoded_segments
+            output_filename: Output filename
+            metadata: Optional ID3 tags written during export
+
+        Returns:
+            Path to the generated audiobook
+        """
+        # Pause before every segment after the first, longer across chapter breaks
+        audio_segments: List[AudioSegment] = []
+        pauses_ms: List[int] = []
         current_chapter = None
 
-        for i, segment in enumerate(audio_segments):
+        for i, segment in enumerate(decoded_segments):
+            if segment is None:
+                continue
+
+            pause_ms = Config.PAUSE_BETWEEN_SENTENCES
+
             if segments_info and i < len(segments_info):
                 segment_info = segments_info[i]
                 chapter_num = segment_info.get("chapter", 1)
 
-                # Add chapter break if new chapter
+                # A chapter break is padded by a sentence pause on each side
                 if current_chapter is not None and chapter_num != current_chapter:
-                    final_segments.append(self.add_silence(Config.PAUSE_BETWEEN_CHAPTERS))
+                    pause_ms += Config.PAUSE_BETWEEN_CHAPTERS + Config.PAUSE_BETWEEN_SENTENCES
                     logger.info(f"Added chapter break before chapter {chapter_num}")
 
                 current_chapter = chapter_num
 
-            final_segments.append(segment)
+            if audio_segments:
+                pauses_ms.append(pause_ms)
+            audio_segments.append(segment)
 
-        # Concatenate all segments
-        audiobook = self.concatenate_audio_segments(final_segments, add_pauses=True)
+        if not audio_segments:
+            logger.error("No valid audio segments found")
+            return None
+
+        # Concatenate all segments, then level the whole file in one pass so segments keep their relative loudness
+        audiobook = self._join_segments(audio_segments, pauses_ms)
+        audiobook = self.normalize_audio(audiobook)
 
         # Add fade in/out
         audiobook = self.add_fade(audiobook, fade_in_ms=1000, fade_out_ms=2000)
 
         # Export to file
-        output_path = Config.get_output_path(output_filename)
-        audiobook.export(output_path, format="mp3", bitrate="128k")
+        output_path = Path(Config.get_output_path(output_filename))
+        self._export_mp3(audiobook, str(output_path), tags=metadata)
 
         logger.info(f"Audiobook created: {output_path}")
         logger.info(f"Duration: {len(audiobook) / 1000:.1f} seconds")
@@ -148,7 +373,9 @@ class AudioProcessor:
         audio_bytes_list: List[bytes],
         segments_info: Optional[List[Dict]] = None,
         output_prefix: str = "chapter",
-    ) -> List[str]:
+        metadata: Optional[Dict[str, Any]] = None,
+        decoded_segments: Optional[List[Optional[AudioSegment]]] = None,
+    ) -> List[Path]:
         """
         Create separate audio files for each chapter.
 
@@ -156,13 +383,17 @@ class AudioProcessor:
             audio_bytes_list: List of audio content as bytes
             segments_info: Metadata for segments
             output_prefix: Prefix for output files
+            metadata: Optional ID3 tags written during export
+            decoded_segments: Segments already decoded by the pipeline, skips decoding audio_bytes_list
 
         Returns:
             List of paths to generated chapter files
         """
         if not segments_info:
             logger.warning("No segment info provided, creating single file")
-            result = self.create_audiobook_from_bytes(audio_bytes_list, segments_info)
+            result = self.create_audiobook_from_bytes(
+                audio_bytes_list, segments_info, metadata=metadata, decoded_segments=decoded_segments
+            )
             return [result] if result else []
 
         # Group segments by chapter
@@ -174,15 +405,19 @@ class AudioProcessor:
                     chapters[chapter_num] = []
                 chapters[chapter_num].append((i, segment_info))
 
+        # Decode everything once, then slice the decoded segments per chapter
+        if decoded_segments is None:
+            decoded_segments = self.decode_segments(audio_bytes_list)
+
         # Create audio file for each chapter
         chapter_files = []
         for chapter_num in sorted(chapters.keys()):
             chapter_segments = chapters[chapter_num]
-            chapter_audio_bytes = [audio_bytes_list[i] for i, _ in chapter_segments]
+            chapter_decoded = [decoded_segments[i] for i, _ in chapter_segments]
             chapter_info = [info for _, info in chapter_segments]
 
             filename = f"{output_prefix}_{chapter_num:02d}.mp3"
-            output_path = self.create_audiobook_from_bytes(chapter_audio_bytes, chapter_info, filename)
+            output_path = self._assemble(chapter_decoded, chapter_info, filename, metadata)
 
             if output_path:
                 chapter_files.append(output_path)
@@ -190,25 +425,135 @@ class AudioProcessor:
 
         return chapter_files
 
+    def open_streaming_writer(self, output_filename: str) -> "StreamingMP3Writer":
+        """
+        Open an MP3 file that segments are appended to as soon as they are synthesized.
+
+        Args:
+            output_filename: Output filename
+
+        Returns:
+            Writer accepting segments in any order
+        """
+        return StreamingMP3Writer(self, Path(Config.get_output_path(output_filename)))
+
+    def _export_mp3(
+        self,
+        audio: AudioSegment,
+        output_path: str,
+        bitrate: int = 128000,
+        tags: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Encode audio to an MP3 file in-process with PyAV.
+
+        Args:
+            audio: Audio to encode
+            output_path: Destination file path
+            bitrate: Target bitrate in bits per second
+            tags: Optional ID3 tags
+        """
+        sample_format = _AV_SAMPLE_FORMATS.get(audio.sample_width)
+        layout = _AV_LAYOUTS.get(audio.channels)
+        if sample_format is None or layout is None:
+            # Formats PyAV is not fed directly still go through ffmpeg
+            audio.export(output_path, format="mp3", bitrate=f"{bitrate // 1000}k", tags=tags)
+            return
+
+        # Interleaved samples as a single row, encoded one second at a time
+        samples = np.frombuffer(audio.raw_data, dtype=_SAMPLE_DTYPES[audio.sample_width]).reshape(1, -1)
+        step = audio.frame_rate * audio.channels
+
+        with av.open(output_path, "w", format="mp3") as container:
+            stream = container.add_stream("libmp3lame", rate=audio.frame_rate, layout=layout)
+            stream.bit_rate = bitrate
+            if tags:
+                container.metadata.update({key: str(value) for key, value in tags.items()})
+
+            for start in range(0, samples.shape[1], step):
+                frame = av.AudioFrame.from_ndarray(
+                    samples[:, start : start + step], format=sample_format, layout=layout
+                )
+                frame.sample_rate = audio.frame_rate
+                for packet in stream.encode(frame):
+                    container.mux(packet)
+
+            # Flush the encoder
+            for packet in stream.encode(None):
+                container.mux(packet)
+
     def add_metadata(self, audio_file: str, metadata: Dict[str, Any]) -> None:
         """
         Add metadata to audio file.
 
+        Tags are written in place, without decoding or re-encoding the audio.
+
         Args:
             audio_file: Path to audio file
             metadata: Dictionary with metadata (title, artist, album, etc.)
         """
         try:
-            # Load audio
-            audio = AudioSegment.from_mp3(audio_file)
+            try:
+                tags = EasyID3(audio_file)
+            except ID3NoHeaderError:
+                tags = EasyID3()
 
-            # Export with metadata
-            audio.export(audio_file, format="mp3", bitrate="128k", tags=metadata)
+            for key, value in metadata.items():
+                if key in EasyID3.valid_keys:
+                    tags[key] = str(value)
+                else:
+                    logger.warning(f"Skipping unsupported metadata field: {key}")
+
+            tags.save(audio_file)
 
             logger.info(f"Added metadata to {audio_file}")
         except Exception as e:
             logger.error(f"Failed to add metadata to {audio_file}: {e}")
 
+    def tag_and_probe(self, audio_files: List[Path], metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Write metadata to MP3 files and read their stream info, opening each file once.
+
+        Args:
+            audio_files: Paths to MP3 files
+            metadata: Dictionary with metadata (title, artist, album, etc.)
+
+        Returns:
+            Audio information per file, in input order; empty for files that could not be processed
+        """
+        tags = {}
+        for key, value in metadata.items():
+            if key in EasyID3.valid_keys:
+                tags[key] = str(value)
+            else:
+                logger.warning(f"Skipping unsupported metadata field: {key}")
+
+        results = []
+        for audio_file in audio_files:
+            try:
+                mp3: Any = MP3(audio_file, ID3=EasyID3)
+                if mp3.tags is None:
+                    mp3.add_tags()
+                mp3.tags.update(tags)
+                mp3.save()
+
+                results.append(
+                    {
+                        "duration_seconds": mp3.info.length,
+                        "duration_formatted": self.format_duration(mp3.info.length),
+                        "channels": mp3.info.channels,
+                        "sample_rate": mp3.info.sample_rate,
+                        "bitrate": mp3.info.bitrate,
+                        "file_size": os.path.getsize(audio_file),
+                    }
+                )
+                logger.info(f"Added metadata to {audio_file}")
+            except Exception as e:
+                logger.error(f"Failed to tag {audio_file}: {e}")
+                results.append({})
+
+        return results
+
     def get_audio_info(self, audio_file: str) -> Dict[str, Any]:
         """
         Get information about an audio file.
@@ -246,15 +591,144 @@ class AudioProcessor:
             return f"{minutes:02d}:{seconds:02d}"
 
     def cleanup(self) -> None:
-        """Clean up temporary files."""
-        try:
-            import shutil
+        """Release cached buffers and stop the decode pipeline. Audio is processed in memory, so no files remain."""
+        self._silence_cache.clear()
+        self._silence_mp3_cache.clear()
+
+        if self._pipeline is not None:
+            self._pipeline.shutdown(cancel_futures=True)
+            self._pipeline = None
+            self._pipeline_futures = {}
 
-            shutil.rmtree(self.temp_dir)
-            logger.info("Temporary files cleaned up")
-        except Exception as e:
-            logger.warning(f"Failed to cleanup temp directory: {e}")
 
-    def __del__(self) -> None:
-        """Cleanup on deletion."""
-        self.cleanup()
+class StreamingMP3Writer:
+    """
+    Writes MP3 segments straight to disk in index order.
+
+    MP3 frames decode independently, so segments and pre-encoded silence are byte-concatenated
+    without decoding. Only segments that arrive ahead of a missing one are held in memory.
+    """
+
+    def __init__(self, processor: AudioProcessor, output_path: Path) -> None:
+        """
+        Initialize streaming writer.
+
+        Args:
+            processor: Processor providing the encoded silence between segments
+            output_path: Destination file path
+        """
+        self.output_path = output_path
+        self.next_index = 0
+        self.segments_written = 0
+        self._processor = processor
+        self._file = open(output_path, "wb")
+        self._pending: Dict[int, Tuple[bytes, Optional[Dict]]] = {}
+        self._format: Optional[Tuple[int, int, int]] = None
+        self._current_chapter: Optional[int] = None
+
+    def append(self, index: int, audio_bytes: bytes, segment_info: Optional[Dict] = None) -> None:
+        """
+        Add a segment, writing it and any buffered successors once all earlier segments are written.
+
+        Args:
+            index: Position of the segment in the audiobook
+            audio_bytes: MP3 content as bytes, empty for a failed segment
+            segment_info: Optional segment metadata, used for chapter pauses
+        """
+        self._pending[index] = (audio_bytes, segment_info)
+        while self.next_index in self._pending:
+            self._write(*self._pending.pop(self.next_index))
+            self.next_index += 1
+
+    def _write(self, audio_bytes: bytes, segment_info: Optional[Dict]) -> None:
+        """Write one segment, preceded by the same pause _assemble would insert."""
+        if not audio_bytes:
+            return
+
+        audio_bytes = _strip_id3v2(audio_bytes)
+        if self._format is None:
+            # Silence is encoded to match the first segment, keeping the stream constant bitrate
+            info: Any = MP3(io.BytesIO(audio_bytes)).info
+            self._format = (info.sample_rate, info.channels, info.bitrate)
+
+        # A segment's Xing/Info frame describes only that segment; left mid-stream, the first one
+        # makes players report the length of the first segment and seek within it
+        audio_bytes = _strip_xing(audio_bytes)
+
+        pause_ms = Config.PAUSE_BETWEEN_SENTENCES
+        if segment_info:
+            chapter_num = segment_info.get("chapter", 1)
+            if self._current_chapter is not None and chapter_num != self._current_chapter:
+                pause_ms += Config.PAUSE_BETWEEN_CHAPTERS + Config.PAUSE_BETWEEN_SENTENCES
+            self._current_chapter = chapter_num
+
+        if self.segments_written:
+            self._file.write(self._processor._silence_mp3(pause_ms, *self._format))
+        self._file.write(audio_bytes)
+        self.segments_written += 1
+
+    def close(self) -> Path:
+        """
+        Flush any segments still waiting on a missing predecessor and close the file.
+
+        Returns:
+            Path to the written audiobook
+        """
+        if self._pending:
+            logger.warning(f"{len(self._pending)} segments arrived after a missing segment, writing them in order")
+            for index in sorted(self._pending):
+                self._write(*self._pending.pop(index))
+
+        self._file.close()
+        logger.info(f"Audiobook streamed to {self.output_path} ({self.segments_written} segments)")
+        return self.output_path
+
+
+def _strip_id3v2(audio_bytes: bytes) -> bytes:
+    """Drop a leading ID3v2 tag so only MP3 frames are concatenated."""
+    if audio_bytes[:3] != b"ID3" or len(audio_bytes) < 10:
+        return audio_bytes
+    # Tag size is a 28-bit syncsafe integer, excluding the 10-byte header
+    size = (audio_bytes[6] << 21) | (audio_bytes[7] << 14) | (audio_bytes[8] << 7) | audio_bytes[9]
+    if audio_bytes[5] & 0x10:  # Footer present
+        size += 10
+    return audio_bytes[10 + size :]
+
+
+def _strip_xing(audio_bytes: bytes) -> bytes:
+    """Drop a leading Xing, Info or VBRI frame, which carries no audio, so only audio frames are concatenated."""
+    if len(audio_bytes) < 4 or audio_bytes[0] != 0xFF or (audio_bytes[1] & 0xE6) != 0xE2:
+        return audio_bytes  # Not an MPEG Layer III frame header
+
+    version = (audio_bytes[1] >> 3) & 0x03
+    bitrate_index = audio_bytes[2] >> 4
+    rate_index = (audio_bytes[2] >> 2) & 0x03
+    if version == 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return audio_bytes
+
+    mpeg1 = version == 3
+    mono = (audio_bytes[3] >> 6) == 3
+    bitrate = _MP3_BITRATES[mpeg1][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (audio_bytes[2] >> 1) & 0x01
+    frame_length = (144 if mpeg1 else 72) * bitrate // sample_rate + padding
+
+    # The Xing/Info tag follows the side information, VBRI sits at a fixed offset
+    side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+    xing = audio_bytes[4 + side_info : 8 + side_info]
+    if xing in (b"Xing", b"Info") or audio_bytes[36:40] == b"VBRI":
+        return audio_bytes[frame_length:]
+    return audio_bytes
+
+
+def _get_fade_ramp(frames: int, rising: bool) -> np.ndarray:
+    """Return a cached read-only linear gain ramp over the given number of frames."""
+    key = (frames, rising)
+    ramp = _FADE_CACHE.get(key)
+    if ramp is None:
+        ramp = np.linspace(0.0, 1.0, frames, dtype=np.float32)
+        if not rising:
+            ramp = ramp[::-1]
+        ramp.setflags(write=False)
+        _FADE_CACHE[key] = ramp
+    return ramp
@@ -4,6 +4,12 @@ Configuration module for the audiobook generator.
 
 import logging
 import os
+import re
+from typing import Dict, Optional, Tuple
+
+# Patterns for SSML size estimation, matched against the UTF-8 encoded text
+_SENTENCE_END_RE = re.compile(rb"[.!?]+")
+_NUMBER_RE = re.compile(rb"\b\d+\b")
 
 
 class Config:
@@ -24,12 +30,28 @@ class Config:
     CHUNK_SIZE = 3500  # Conservative for 4000 byte limit
     # Alternative: CHUNK_SIZE = 3500  # For actual 5000 byte API limit
     MAX_API_BYTES = 4000  # Your target limit (API supports 5000)
+    MAX_DECODE_WORKERS = min(8, os.cpu_count() or 1)  # Parallel MP3 decodes (each runs ffmpeg)
+    TTS_MAX_CONCURRENCY = 8  # Parallel TTS requests in stream_synthesize
+    TTS_QUOTA_RETRIES = 5  # Retries of a request rejected for exhausted quota
+    TTS_QUOTA_BACKOFF_SEC = 1.0  # First retry delay, doubled on each further retry
+    # Long-form synthesis (SynthesizeLongAudio) writes to Cloud Storage; disabled unless a gs:// prefix is set
+    LONG_AUDIO_OUTPUT_URI = os.getenv("TTS_LONG_AUDIO_URI", "")
+    LONG_AUDIO_THRESHOLD = 100_000  # Characters of text above which a book is sent as one long audio request
+    LONG_AUDIO_LOCATION = "global"
+    LONG_AUDIO_POLL_SEC = 5
 
     # File settings
     INPUT_DIR = "input"
     OUTPUT_DIR = "output"
     SUPPORTED_TEXT_FORMATS = [".txt", ".md"]
     SUPPORTED_EBOOK_FORMATS = [".epub", ".pdf"]
+    READ_CHUNK_SIZE = 1 << 20  # Characters per read when loading text files
+    ENCODING_PROBE_SIZE = 64 * 1024  # Bytes sampled to detect a text file's encoding
+    TTS_CACHE_DIR = ".tts_cache"  # Synthesized audio cache, inside OUTPUT_DIR
+    TTS_CACHE_MB = 500  # Least recently used entries are evicted above this size
+    PARTS_DIR = ".parts"  # Audio a running job synthesized, kept for --resume, inside OUTPUT_DIR
+    VOICE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fast-sttext")
+    VOICE_CACHE_TTL_SEC = 24 * 60 * 60  # Voice catalogs change rarely
     # Voice options
     VOICE_OPTIONS = {
         "pt-BR": {
@@ -42,28 +64,47 @@ class Config:
         },
     }
 
+    # Preferred voice per (language, gender, premium), filled by _build_voice_cache
+    _VOICE_CACHE: Dict[Tuple[str, str, bool], str] = {}
+
+    @classmethod
+    def _build_voice_cache(cls) -> None:
+        """Resolve the preferred voice for every VOICE_OPTIONS entry."""
+        cls._VOICE_CACHE = {}
+        for language_code, genders in cls.VOICE_OPTIONS.items():
+            for gender, voices in genders.items():
+                if not voices:
+                    continue
+
+                # Fallback to standard voices
+                standard_voices = [v for v in voices if "Standard" in v]
+                standard_voice = standard_voices[0] if standard_voices else voices[0]
+                cls._VOICE_CACHE[(language_code, gender, False)] = standard_voice
+
+                # Prefer Wavenet (premium) voices if available
+                wavenet_voices = [v for v in voices if "Wavenet" in v]
+                premium_voice = wavenet_voices[0] if wavenet_voices else standard_voice
+                cls._VOICE_CACHE[(language_code, gender, True)] = premium_voice
+
     @classmethod
     def get_voice_name(cls, language_code: str, gender: str, premium: bool = True) -> str:
         """Get appropriate voice name based on language and gender."""
-        voices = cls.VOICE_OPTIONS.get(language_code, {}).get(gender, [])
-        if not voices:
+        voice = cls._VOICE_CACHE.get((language_code, gender, bool(premium)))
+        if voice is None:
             logging.warning("No voices avaliable, check VOICE_OPTIONS")
             return "None"
 
-        # Prefer Wavenet (premium) voices if available
-        if premium:
-            wavenet_voices = [v for v in voices if "Wavenet" in v]
-            if wavenet_voices:
-                return wavenet_voices[0]
+        return voice
 
-        # Fallback to standard voices
-        standard_voices = [v for v in voices if "Standard" in v]
-        return standard_voices[0] if standard_voices else voices[0]
+    # Output directory already created by get_output_path
+    _created_output_dir: Optional[str] = None
 
     @classmethod
     def get_output_path(cls, filename: str) -> str:
         """Get full output path for a filename."""
-        os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
+        if cls._created_output_dir != cls.OUTPUT_DIR:
+            os.makedirs(cls.OUTPUT_DIR, exist_ok=True)
+            cls._created_output_dir = cls.OUTPUT_DIR
         return os.path.join(cls.OUTPUT_DIR, filename)
 
     @classmethod
@@ -88,11 +129,14 @@ class Config:
     @classmethod
     def __estimate_ssml_size(cls, text: str) -> int:
         """Estimate SSML size in bytes."""
-        import re
+        encoded = text.encode("utf-8")
 
-        sentence_count = len(re.findall(r"[.!?]+", text))
-        number_count = len(re.findall(r"\b\d+\b", text))
-        base_size = len(text.encode("utf-8"))
+        sentence_count = sum(1 for _ in _SENTENCE_END_RE.finditer(encoded))
+        number_count = sum(1 for _ in _NUMBER_RE.finditer(encoded))
+        base_size = len(encoded)
 
         ssml_overhead = 15 + (sentence_count * 25) + (number_count * 35)
         return base_size + ssml_overhead
+
+
+Config._build_voice_cache()
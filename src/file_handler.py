@@ -3,10 +3,12 @@ File handling module for audiobook generation.
 Handles reading various file formats and preparing text for processing.
 """
 
+import codecs
 import logging
 import os
+import warnings
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from config import Config
 
@@ -27,14 +29,54 @@ class FileHandler:
 
     def list_input_files(self) -> List[str]:
         """List all supported files in input directory."""
-        supported_extensions = Config.SUPPORTED_TEXT_FORMATS + Config.SUPPORTED_EBOOK_FORMATS
+        supported_extensions = set(Config.SUPPORTED_TEXT_FORMATS + Config.SUPPORTED_EBOOK_FORMATS)
 
-        files: List[Path] = []
-        for ext in supported_extensions:
-            pattern = f"*{ext}"
-            files.extend(Path(self.input_dir).glob(pattern))
+        # Single directory pass instead of one glob per extension
+        with os.scandir(self.input_dir) as entries:
+            files = [
+                entry.path
+                for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in supported_extensions and entry.is_file()
+            ]
 
-        return [str(f) for f in files]
+        return sorted(files)
+
+    def iter_text_chunks(self, filepath: str, encoding: str = "utf-8", chunk_size: int = 0) -> Iterator[str]:
+        """
+        Read a text file incrementally.
+
+        Args:
+            filepath: Path to the text file
+            encoding: Text encoding of the file
+            chunk_size: Characters per chunk (defaults to Config.READ_CHUNK_SIZE)
+
+        Yields:
+            Consecutive chunks of the file content
+        """
+        chunk_size = chunk_size or Config.READ_CHUNK_SIZE
+        with open(filepath, "r", encoding=encoding, buffering=chunk_size) as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    def _detect_encoding(self, filepath: str) -> str:
+        """Detect the encoding of a text file from its first bytes."""
+        with open(filepath, "rb") as f:
+            head = f.read(Config.ENCODING_PROBE_SIZE)
+
+        # UTF-8 is the common case; a character cut at the end of the probe is not an error
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+            return "utf-8"
+        except UnicodeDecodeError:
+            pass
+
+        # Otherwise assume a Western single-byte file, like the Portuguese texts this tool mostly reads.
+        # cp1252 adds curly quotes and dashes to latin-1, which still accepts the bytes cp1252 leaves undefined
+        try:
+            head.decode("cp1252")
+            return "cp1252"
+        except UnicodeDecodeError:
+            return "latin-1"
 
     def read_text_file(self, filepath: str) -> str:
         """
@@ -47,26 +89,18 @@ class FileHandler:
             File content as string
         """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                content = f.read()
+            encoding = self._detect_encoding(filepath)
 
-            logger.info(f"Read text file: {filepath} ({len(content)} characters)")
-            return content
+            try:
+                content = "".join(self.iter_text_chunks(filepath, encoding))
+            except UnicodeDecodeError:
+                # The probe only sees the start of the file; latin-1 accepts any byte sequence
+                logger.warning(f"Could not decode {filepath} as {encoding}, falling back to latin-1")
+                encoding = "latin-1"
+                content = "".join(self.iter_text_chunks(filepath, encoding))
 
-        except UnicodeDecodeError:
-            # Try different encodings
-            encodings = ["latin-1", "iso-8859-1", "cp1252"]
-            for encoding in encodings:
-                try:
-                    with open(filepath, "r", encoding=encoding) as f:
-                        content = f.read()
-                    logger.info(f"Read text file with {encoding} encoding: {filepath}")
-                    return content
-                except UnicodeDecodeError:
-                    continue
-
-            logger.error(f"Failed to read file with any encoding: {filepath}")
-            raise
+            logger.info(f"Read text file with {encoding} encoding: {filepath} ({len(content)} characters)")
+            return content
 
         except Exception as e:
             logger.error(f"Failed to read text file {filepath}: {e}")
@@ -84,27 +118,71 @@ class FileHandler:
         """
         try:
             import ebooklib  # type: ignore
-            from bs4 import BeautifulSoup  # type: ignore
+            from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning  # type: ignore
             from ebooklib import epub
 
             book = epub.read_epub(filepath)
-            text = ""
+            parts = []
+
+            # EPUB documents are XHTML; parse them with lxml's lenient HTML parser on purpose
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", XMLParsedAsHTMLWarning)
+                for item in book.get_items():
+                    if item.get_type() == ebooklib.ITEM_DOCUMENT:
+                        soup = BeautifulSoup(item.get_content(), "lxml")
+                        parts.append(soup.get_text() + "\n")
 
-            for item in book.get_items():
-                if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), "html.parser")
-                    text += soup.get_text() + "\n"
+            text = "".join(parts)
 
             logger.info(f"Extracted text from EPUB: {filepath} ({len(text)} characters)")
             return text
 
         except ImportError:
-            logger.error("ebooklib and beautifulsoup4 not installed. Install with: pip install ebooklib beautifulsoup4")
+            logger.error(
+                "ebooklib, beautifulsoup4 and lxml not installed. "
+                "Install with: pip install ebooklib beautifulsoup4 lxml"
+            )
             raise
         except Exception as e:
             logger.error(f"Failed to read EPUB file {filepath}: {e}")
             raise
 
+    def read_pdf_file(self, filepath: str) -> str:
+        """
+        Read a PDF file and extract text content.
+
+        Args:
+            filepath: Path to the PDF file
+
+        Returns:
+            Extracted text content
+        """
+        try:
+            import pypdfium2 as pdfium  # type: ignore
+
+            # PDFium is not thread-safe, so pages are extracted one after another
+            pdf = pdfium.PdfDocument(filepath)
+            try:
+                pages = []
+                for page in pdf:
+                    textpage = page.get_textpage()
+                    pages.append(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+            finally:
+                pdf.close()
+
+            text = "\n".join(pages)
+            logger.info(f"Extracted text from PDF: {filepath} ({len(text)} characters)")
+            return text
+
+        except ImportError:
+            logger.error("pypdfium2 not installed. Install with: pip install pypdfium2")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to read PDF file {filepath}: {e}")
+            raise
+
     def read_file(self, filepath: str) -> str:
         """
         Read any supported file format and return text content.
@@ -124,8 +202,8 @@ class FileHandler:
 
         if extension in Config.SUPPORTED_TEXT_FORMATS:
             return self.read_text_file(str(file_path))
-        # elif extension == ".pdf":
-        #     return self.read_pdf_file(str(file_path))
+        elif extension == ".pdf":
+            return self.read_pdf_file(str(file_path))
         elif extension == ".epub":
             return self.read_epub_file(str(file_path))
         else:
@@ -3,33 +3,75 @@
 Main application for fast-sttext audiobook generator.
 Converts text files to audiobooks using Google Text-to-Speech API.
 """
+
+import atexit
+import functools
+import hashlib
 import logging
 import os
+import queue
+import re
+import shutil
 import sys
+import time
+from collections import Counter
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import click
 from colorama import Fore, Style, init
-from tqdm import tqdm
 
-from audio_processor import AudioProcessor
 from config import Config
 from file_handler import FileHandler
 from text_processor import TextProcessor, TextSegment
-from tts_engine import TTSEngine
+from tts_cache import TTSCache
+
+# The TTS client, audio stack and tqdm are imported where used, so `files`, `config` and --help start fast
+if TYPE_CHECKING:
+    from google.cloud import texttospeech
 
-# Initialize colorama for colored output
-init()
+    from audio_processor import AudioProcessor
+    from tts_engine import TTSEngine
+
+# Configure logging; file writes happen on a listener thread so synthesis workers never block on disk
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, logging.FileHandler("audiobook_generator.log"), respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("audiobook_generator.log"), logging.StreamHandler()],
+    handlers=[QueueHandler(_log_queue), logging.StreamHandler()],
 )
 logger = logging.getLogger(__name__)
 
+# Color codes and static console messages, formatted once at import
+_BLUE = Fore.BLUE
+_GREEN = Fore.GREEN
+_RED = Fore.RED
+_YELLOW = Fore.YELLOW
+_CYAN = Fore.CYAN
+_RESET = Style.RESET_ALL
+
+_MSG_READING = f"{_BLUE}📖 Reading input file...{_RESET}"
+_MSG_EMPTY_INPUT = f"{_RED}✗ Input file is empty or contains no readable text{_RESET}"
+_MSG_PROCESSING = f"{_BLUE}🔧 Processing text...{_RESET}"
+_MSG_PREVIEW = f"{_YELLOW}Preview mode: Using only first 5 segments{_RESET}"
+_MSG_GENERATING = f"{_BLUE}🎤 Generating audio segments...{_RESET}"
+_MSG_GENERATING_LONG = f"{_BLUE}🎤 Generating audio with long audio synthesis...{_RESET}"
+_MSG_CREATING = f"{_BLUE}🎵 Creating audiobook...{_RESET}"
+_MSG_CREATED = f"{_GREEN}✓ Successfully created audiobook(s){_RESET}"
+_MSG_CREATE_FAILED = f"{_RED}✗ Failed to create audiobook{_RESET}"
+_MSG_STARTING = f"{_BLUE}🚀 Starting audiobook generation...{_RESET}"
+
+# Basic validation for language codes like 'pt-BR', 'en-US', etc.
+_LANG_RE = re.compile(r"^[a-z]{2}(-[A-Z]{2})?$")
+
+# Stops at the first visible character instead of copying the whole text like str.strip
+_NON_WHITESPACE_RE = re.compile(r"\S")
+
 
 class AudiobookGenerator:
     """Main class for audiobook generation."""
@@ -39,6 +81,7 @@ class AudiobookGenerator:
         language: str = "pt-BR",
         voice_gender: str = "FEMALE",
         premium_voices: bool = True,
+        tts_client: Optional["texttospeech.TextToSpeechClient"] = None,
     ):
         """
         Initialize audiobook generator.
@@ -47,26 +90,55 @@ class AudiobookGenerator:
             language: Language code (e.g., "pt-BR", "en-US")
             voice_gender: Voice gender (MALE, FEMALE, NEUTRAL)
             premium_voices: Whether to use premium Wavenet voices
+            tts_client: Already constructed TTS client to reuse instead of creating one
         """
         self.language = language
         self.voice_gender = voice_gender
         self.premium_voices = premium_voices
-
-        # Initialize components
-        self.file_handler = FileHandler()
-        self.text_processor = TextProcessor()
-        self.tts_engine = TTSEngine(language, voice_gender, premium_voices)
-        self.audio_processor = AudioProcessor()
+        self._tts_client = tts_client
 
         logger.info(f"Audiobook generator initialized with language: {language}, voice: {voice_gender}")
 
+    # Components are built on first use, so commands like `voices` skip what they don't need
+    @functools.cached_property
+    def file_handler(self) -> FileHandler:
+        """Input file reader."""
+        return FileHandler()
+
+    @functools.cached_property
+    def text_processor(self) -> TextProcessor:
+        """Text segmenter and SSML builder."""
+        return TextProcessor()
+
+    @functools.cached_property
+    def tts_engine(self) -> "TTSEngine":
+        """Text-to-Speech engine; constructing it opens a gRPC channel."""
+        from tts_engine import TTSEngine
+
+        return TTSEngine(self.language, self.voice_gender, self.premium_voices, client=self._tts_client)
+
+    @functools.cached_property
+    def audio_processor(self) -> "AudioProcessor":
+        """Audio assembly and export."""
+        from audio_processor import AudioProcessor
+
+        return AudioProcessor()
+
+    @functools.cached_property
+    def tts_cache(self) -> TTSCache:
+        """On-disk cache of synthesized segments."""
+        return TTSCache()
+
     def generate_audiobook(
         self,
         input_file: str,
         output_name: Optional[str] = None,
         split_chapters: bool = False,
         preview_mode: bool = False,
-    ) -> List[str]:
+        stream: bool = False,
+        resume: bool = False,
+        keep_parts: bool = False,
+    ) -> List[Path]:
         """
         Generate audiobook from input file.
 
@@ -75,14 +147,18 @@ class AudiobookGenerator:
             output_name: Custom output filename
             split_chapters: Whether to create separate files for chapters
             preview_mode: Generate only first few segments for preview
+            stream: Write segments to disk as they are synthesized instead of holding the whole book in memory
+            resume: Reuse audio saved by an earlier, interrupted run of the same job instead of discarding it
+            keep_parts: Keep the job's saved audio after the audiobook is created
 
         Returns:
             List of generated audio file paths
         """
         logger.info(f"Starting audiobook generation for: {input_file}")
+        input_path = Path(input_file)
 
         # Validate and read input
-        text_content = self._read_and_validate_input(input_file)
+        text_content = self._read_and_validate_input(input_path)
         if not text_content:
             return []
 
@@ -91,148 +167,380 @@ class AudiobookGenerator:
         if not segments:
             return []
 
-        # Generate audio from segments
-        audio_data = self._generate_audio_segments(segments)
-        if not audio_data:
-            return []
+        # Audio synthesized by this job is held in its parts until the audiobook is created
+        parts = self._job_parts(input_path, resume)
 
-        # Create final audiobook files
-        return self._create_audiobook_files(audio_data, input_file, output_name, split_chapters, preview_mode)
+        # Streaming writes MP3 frames as they arrive; it cannot split chapters or apply normalization and fades
+        if stream and not split_chapters:
+            output_files = self._stream_audiobook(segments, input_path, output_name, preview_mode, parts)
+        else:
+            # Long books go out as one long-running operation instead of thousands of requests
+            audio_data = None
+            if self._use_long_audio(segments, split_chapters, preview_mode):
+                audio_data = self._generate_long_audio(segments, input_path)
+                if not audio_data:
+                    logger.warning("Long audio synthesis failed, falling back to per-segment synthesis")
+            if not audio_data:
+                audio_data = self._generate_audio_segments(segments, parts)
+            if not audio_data:
+                return []
 
-    def _read_and_validate_input(self, input_file: str) -> str:
+            # Create final audiobook files
+            output_files = self._create_audiobook_files(
+                audio_data, input_path, output_name, split_chapters, preview_mode
+            )
+
+        if output_files:
+            self._finish_parts(parts, keep_parts)
+
+        return output_files
+
+    def _read_and_validate_input(self, input_path: Path) -> str:
         """Read and validate input file."""
-        # Validate input file exists and is readable
-        input_path = Path(input_file)
-        if not input_path.exists():
-            raise FileNotFoundError(f"Input file not found: {input_file}")
+        # Validate input file exists and is readable; exists() is only checked to pick the error
         if not input_path.is_file():
-            raise ValueError(f"Input path is not a file: {input_file}")
+            if input_path.exists():
+                raise ValueError(f"Input path is not a file: {input_path}")
+            raise FileNotFoundError(f"Input file not found: {input_path}")
 
         # Read input file
-        print(f"{Fore.BLUE}📖 Reading input file...{Style.RESET_ALL}")
+        print(_MSG_READING)
         try:
-            text_content = self.file_handler.read_file(input_file)
-            print(f"{Fore.GREEN}✓ Successfully read {len(text_content)} characters{Style.RESET_ALL}")
+            text_content = self.file_handler.read_file(str(input_path))
+            print(f"{_GREEN}✓ Successfully read {len(text_content)} characters{_RESET}")
 
             # Validate content
-            if not text_content.strip():
-                print(f"{Fore.RED}✗ Input file is empty or contains no readable text{Style.RESET_ALL}")
+            if not _NON_WHITESPACE_RE.search(text_content):
+                print(_MSG_EMPTY_INPUT)
                 return ""
 
             return text_content
 
         except Exception as e:
-            print(f"{Fore.RED}✗ Failed to read file: {e}{Style.RESET_ALL}")
+            print(f"{_RED}✗ Failed to read file: {e}{_RESET}")
             return ""
 
     def _process_text_to_segments(self, text_content: str, preview_mode: bool) -> List[TextSegment]:
         """Process text into segments for TTS."""
-        print(f"{Fore.BLUE}🔧 Processing text...{Style.RESET_ALL}")
+        print(_MSG_PROCESSING)
         try:
-            segments = self.text_processor.create_segments(text_content, Config.CHUNK_SIZE)
+            batch = self.text_processor.create_segment_batch(text_content, Config.CHUNK_SIZE)
+            segments = batch.segments
+            chapter_counts = batch.chapter_counts
 
             if preview_mode:
                 segments = segments[:5]  # Only first 5 segments for preview
-                print(f"{Fore.YELLOW}Preview mode: Using only first 5 segments{Style.RESET_ALL}")
+                chapter_counts = Counter(segment.chapter_number for segment in segments)
+                print(_MSG_PREVIEW)
 
-            print(f"{Fore.GREEN}✓ Created {len(segments)} text segments{Style.RESET_ALL}")
+            print(f"{_GREEN}✓ Created {len(segments)} text segments{_RESET}")
 
             # Show chapter information
-            self._display_chapter_info(segments)
+            self._display_chapter_info(chapter_counts)
 
             return segments
 
         except Exception as e:
-            print(f"{Fore.RED}✗ Failed to process text: {e}{Style.RESET_ALL}")
+            print(f"{_RED}✗ Failed to process text: {e}{_RESET}")
             return []
 
-    def _display_chapter_info(self, segments: List[TextSegment]) -> None:
-        """Display chapter information from segments."""
-        chapters = {}
-        for segment in segments:
-            chapter_num = segment.chapter_number
-            if chapter_num not in chapters:
-                chapters[chapter_num] = 0
-            chapters[chapter_num] += 1
+    def _display_chapter_info(self, chapter_counts: "Counter[int]") -> None:
+        """Display chapter information from per-chapter segment counts."""
+        print(f"{_CYAN}📚 Found {len(chapter_counts)} chapters{_RESET}")
 
-        print(f"{Fore.CYAN}📚 Found {len(chapters)} chapters{Style.RESET_ALL}")
+    def _generate_audio_segments(
+        self, segments: List[TextSegment], parts: Optional[TTSCache] = None
+    ) -> Optional[tuple]:
+        """
+        Generate audio from text segments.
 
-    def _generate_audio_segments(self, segments: List[TextSegment]) -> Optional[tuple]:
-        """Generate audio from text segments."""
-        print(f"{Fore.BLUE}🎤 Generating audio segments...{Style.RESET_ALL}")
+        Args:
+            segments: Text segments to synthesize
+            parts: The job's parts, consulted after the cache and holding newly synthesized audio;
+                new audio goes straight to the cache without them
 
-        with tqdm(total=len(segments), desc="Synthesizing", unit="segments") as pbar:
+        Returns:
+            Tuple of audio bytes, segment info and decoded segments, or None on failure
+        """
+        from tqdm import tqdm
 
-            def progress_callback(current: int, total: int, segment: TextSegment) -> None:
-                pbar.set_postfix(
-                    {
-                        "chapter": segment.chapter_number,
-                        "paragraph": segment.paragraph_number,
-                    }
-                )
-                pbar.update(1)
+        print(_MSG_GENERATING)
 
+        with tqdm(total=len(segments), desc="Synthesizing", unit="segments") as pbar:
             try:
-                audio_bytes_list = self.tts_engine.batch_synthesize(segments, progress_callback=progress_callback)
+                # Decode segments in worker threads while the remaining ones are synthesized
+                self.audio_processor.start_pipeline()
+
+                # Load previously synthesized segments from the cache, only misses go to the API,
+                # and repeated texts are synthesized once and fanned out to every occurrence
+                _, occurrences = self._group_segments(segments)
+                audio_bytes_list: List[bytes] = [b""] * len(segments)
+                miss_keys: List[str] = []
+
+                resumed = 0
+
+                for cache_key, indices in occurrences.items():
+                    cached = self.tts_cache.get(cache_key)
+                    if cached is None and parts:
+                        cached = parts.get(cache_key)
+                        if cached:
+                            resumed += len(indices)
+                    if cached is None:
+                        miss_keys.append(cache_key)
+                        continue
+                    for i in indices:
+                        audio_bytes_list[i] = cached
+                        self.audio_processor.submit_segment(i, cached)
+                    pbar.update(len(indices))
+
+                if resumed:
+                    print(f"{_CYAN}Resuming: {resumed} segments already synthesized{_RESET}")
+
+                if len(occurrences) < len(segments):
+                    logger.info(f"Synthesizing {len(occurrences)} unique texts for {len(segments)} segments")
+
+                if miss_keys:
+                    step = max(1, len(segments) // 200)  # Redraw about 200 times rather than per segment
+                    pending = 0
+
+                    # Failed segments come back as empty bytes and are skipped during assembly
+                    miss_segments = [segments[occurrences[cache_key][0]] for cache_key in miss_keys]
+                    for miss_index, audio_bytes in self.tts_engine.stream_synthesize(miss_segments):
+                        cache_key = miss_keys[miss_index]
+                        (parts or self.tts_cache).put(cache_key, audio_bytes)
+                        for i in occurrences[cache_key]:
+                            audio_bytes_list[i] = audio_bytes
+                            self.audio_processor.submit_segment(i, audio_bytes)
+
+                        pending += len(occurrences[cache_key])
+                        if pending >= step:
+                            segment = miss_segments[miss_index]
+                            pbar.set_postfix_str(
+                                f"ch={segment.chapter_number} p={segment.paragraph_number}", refresh=False
+                            )
+                            pbar.update(pending)
+                            pending = 0
+
+                    pbar.update(pending)
+                    if not parts:
+                        self.tts_cache.evict()
+
+                decoded_segments = self.audio_processor.collect_pipeline(len(audio_bytes_list))
 
                 # Create segments info for audio processing
-                segments_info = []
-                for segment in segments:
-                    segments_info.append(self.text_processor.get_segment_info(segment))
+                segments_info = self.text_processor.batch_segment_info(segments)
 
-                print(f"{Fore.GREEN}✓ Generated {len(audio_bytes_list)} audio segments{Style.RESET_ALL}")
-                return (audio_bytes_list, segments_info)
+                print(f"{_GREEN}✓ Generated {len(audio_bytes_list)} audio segments{_RESET}")
+                return (audio_bytes_list, segments_info, decoded_segments)
 
             except Exception as e:
-                print(f"{Fore.RED}✗ Failed to generate audio: {e}{Style.RESET_ALL}")
+                print(f"{_RED}✗ Failed to generate audio: {e}{_RESET}")
                 return None
 
-    def _create_audiobook_files(
+    def _parts_dir(self, input_path: Path) -> Path:
+        """Get the directory holding this job's segment parts, identified by input file and voice settings."""
+        job_source = (
+            f"{input_path.resolve()}|{self.language}|{self.voice_gender}|{self.premium_voices}|{Config.CHUNK_SIZE}"
+        )
+        job_id = hashlib.blake2b(job_source.encode("utf-8")).hexdigest()[:12]
+        return Path(Config.OUTPUT_DIR) / Config.PARTS_DIR / job_id
+
+    def _job_parts(self, input_path: Path, resume: bool) -> TTSCache:
+        """
+        Open the store for audio this job synthesizes, keyed like the TTS cache.
+
+        New audio stays out of the shared cache, where other jobs' evictions could remove it, until
+        the audiobook is created. Without resume, parts left by an earlier run are discarded.
+
+        Args:
+            input_path: Input file of the job
+            resume: Keep parts saved by an earlier, interrupted run
+
+        Returns:
+            Cache over this job's parts directory
+        """
+        parts_dir = self._parts_dir(input_path)
+        if not resume and parts_dir.is_dir():
+            print(f"{_YELLOW}Discarding audio saved by an earlier run of this book, use --resume to reuse it{_RESET}")
+            shutil.rmtree(parts_dir, ignore_errors=True)
+        return TTSCache(str(parts_dir))
+
+    def _finish_parts(self, parts: TTSCache, keep_parts: bool) -> None:
+        """Hand a finished job's audio to the shared TTS cache, removing the parts unless they are kept."""
+        if parts.merge_into(self.tts_cache, keep=keep_parts):
+            self.tts_cache.evict()
+        if not keep_parts:
+            shutil.rmtree(parts.cache_dir, ignore_errors=True)
+
+    def _use_long_audio(self, segments: List[TextSegment], split_chapters: bool, preview_mode: bool) -> bool:
+        """Check whether a book should be synthesized with a single long audio operation."""
+        if not Config.LONG_AUDIO_OUTPUT_URI or split_chapters or preview_mode:
+            return False
+        return sum(len(segment.text) for segment in segments) > Config.LONG_AUDIO_THRESHOLD
+
+    def _generate_long_audio(self, segments: List[TextSegment], input_path: Path) -> Optional[tuple]:
+        """Generate audio for the whole book with one SynthesizeLongAudio operation."""
+        from tqdm import tqdm
+
+        print(_MSG_GENERATING_LONG)
+
+        output_gcs_uri = f"{Config.LONG_AUDIO_OUTPUT_URI.rstrip('/')}/{input_path.stem}-{time.time_ns()}.wav"
+
+        with tqdm(total=100, desc="Synthesizing", unit="%") as pbar:
+
+            def progress_callback(percentage: float) -> None:
+                pbar.update(int(percentage) - pbar.n)
+
+            try:
+                ssml = self.text_processor.create_document_ssml(segments)
+                wav_bytes = self.tts_engine.synthesize_long_audio(ssml, output_gcs_uri, progress_callback)
+                pbar.update(100 - pbar.n)
+
+                # Pauses are already in the SSML, so the single decoded file is used as is
+                decoded_segments = [self.audio_processor.bytes_to_audio_segment(wav_bytes, "wav")]
+
+                print(f"{_GREEN}✓ Generated audio for {len(segments)} segments{_RESET}")
+                return ([wav_bytes], None, decoded_segments)
+
+            except Exception as e:
+                print(f"{_RED}✗ Failed to generate audio: {e}{_RESET}")
+                return None
+
+    def _stream_audiobook(
         self,
-        audio_data: tuple,
-        input_file: str,
+        segments: List[TextSegment],
+        input_path: Path,
         output_name: Optional[str],
-        split_chapters: bool,
         preview_mode: bool,
-    ) -> List[str]:
-        """Create final audiobook files from audio data."""
-        audio_bytes_list, segments_info = audio_data
-        input_path = Path(input_file)
+        parts: Optional[TTSCache] = None,
+    ) -> List[Path]:
+        """Synthesize segments and append them to the output file as they complete."""
+        from tqdm import tqdm
+
+        print(_MSG_GENERATING)
+
+        output_name = self._resolve_output_name(input_path, output_name, preview_mode)
+        segments_info = self.text_processor.batch_segment_info(segments)
+        cache_keys, occurrences = self._group_segments(segments)
+        miss_keys: List[str] = []
+        resumed = 0
+        for cache_key, indices in occurrences.items():
+            if self.tts_cache.contains(cache_key):
+                continue
+            if parts and parts.contains(cache_key):
+                resumed += len(indices)
+            else:
+                miss_keys.append(cache_key)
+        miss_set = {i for cache_key in miss_keys for i in occurrences[cache_key]}
+
+        if resumed:
+            print(f"{_CYAN}Resuming: {resumed} segments already synthesized{_RESET}")
+
+        writer = self.audio_processor.open_streaming_writer(output_name)
+
+        with tqdm(total=len(segments), desc="Synthesizing", unit="segments") as pbar:
+
+            def write_cached() -> None:
+                # Cached segments are read only once they are next in line, so they are never buffered
+                while writer.next_index < len(segments) and writer.next_index not in miss_set:
+                    i = writer.next_index
+                    audio_bytes = self.tts_cache.get(cache_keys[i]) or (parts and parts.get(cache_keys[i]))
+                    writer.append(i, audio_bytes or b"", segments_info[i])
+                    pbar.update(1)
+
+            try:
+                write_cached()
+                miss_segments = [segments[occurrences[cache_key][0]] for cache_key in miss_keys]
+                for miss_index, audio_bytes in self.tts_engine.stream_synthesize(miss_segments):
+                    cache_key = miss_keys[miss_index]
+                    (parts or self.tts_cache).put(cache_key, audio_bytes)
+                    for i in occurrences[cache_key]:
+                        writer.append(i, audio_bytes, segments_info[i])
+                    pbar.update(len(occurrences[cache_key]))
+                    write_cached()
+            except Exception as e:
+                print(f"{_RED}✗ Failed to generate audio: {e}{_RESET}")
+                return []
+            finally:
+                output_file = writer.close()
+
+        if miss_keys and not parts:
+            self.tts_cache.evict()
+
+        if not writer.segments_written:
+            print(_MSG_CREATE_FAILED)
+            return []
+
+        print(_MSG_CREATED)
+        self._add_metadata_and_display_info([output_file], input_path)
+        return [output_file]
+
+    def _group_segments(self, segments: List[TextSegment]) -> Tuple[List[str], Dict[str, List[int]]]:
+        """
+        Compute cache keys and group segments that would synthesize to identical audio.
 
+        Args:
+            segments: Text segments in reading order
+
+        Returns:
+            Tuple of (cache key per segment, segment indices per unique key in first-occurrence order)
+        """
+        cache_keys = [self.tts_engine.cache_key(segment) for segment in segments]
+        occurrences: Dict[str, List[int]] = {}
+        for i, cache_key in enumerate(cache_keys):
+            occurrences.setdefault(cache_key, []).append(i)
+        return cache_keys, occurrences
+
+    def _resolve_output_name(self, input_path: Path, output_name: Optional[str], preview_mode: bool) -> str:
+        """Get the output filename, derived from the input file unless given."""
         # Create output filename
         if not output_name:
-            output_name = self.file_handler.create_output_filename(input_file, "preview" if preview_mode else "")
+            output_name = self.file_handler.create_output_filename(str(input_path), "preview" if preview_mode else "")
 
         # Validate output filename
         if not output_name.endswith(".mp3"):
             output_name += ".mp3"
 
+        return output_name
+
+    def _create_audiobook_files(
+        self,
+        audio_data: tuple,
+        input_path: Path,
+        output_name: Optional[str],
+        split_chapters: bool,
+        preview_mode: bool,
+    ) -> List[Path]:
+        """Create final audiobook files from audio data."""
+        audio_bytes_list, segments_info, decoded_segments = audio_data
+        output_name = self._resolve_output_name(input_path, output_name, preview_mode)
+
         # Generate final audiobook
-        print(f"{Fore.BLUE}🎵 Creating audiobook...{Style.RESET_ALL}")
+        print(_MSG_CREATING)
         try:
             if split_chapters:
                 output_files = self.audio_processor.create_chapter_files(
-                    audio_bytes_list, segments_info, output_name.replace(".mp3", "")
+                    audio_bytes_list, segments_info, output_name.replace(".mp3", ""), decoded_segments=decoded_segments
                 )
             else:
                 output_file = self.audio_processor.create_audiobook_from_bytes(
-                    audio_bytes_list, segments_info, output_name
+                    audio_bytes_list, segments_info, output_name, decoded_segments=decoded_segments
                 )
                 output_files = [output_file] if output_file else []
 
             if output_files:
-                print(f"{Fore.GREEN}✓ Successfully created audiobook(s){Style.RESET_ALL}")
+                print(_MSG_CREATED)
                 self._add_metadata_and_display_info(output_files, input_path)
                 return output_files
             else:
-                print(f"{Fore.RED}✗ Failed to create audiobook{Style.RESET_ALL}")
+                print(_MSG_CREATE_FAILED)
                 return []
 
         except Exception as e:
-            print(f"{Fore.RED}✗ Failed to create audiobook: {e}{Style.RESET_ALL}")
+            print(f"{_RED}✗ Failed to create audiobook: {e}{_RESET}")
             return []
 
-    def _add_metadata_and_display_info(self, output_files: List[str], input_path: Path) -> None:
+    def _add_metadata_and_display_info(self, output_files: List[Path], input_path: Path) -> None:
         """Add metadata to output files and display file information."""
         metadata = {
             "title": input_path.stem,
@@ -242,21 +550,18 @@ class AudiobookGenerator:
             "language": self.language,
         }
 
-        for output_file in output_files:
-            if output_file:
-                self.audio_processor.add_metadata(output_file, metadata)
+        output_files = [output_file for output_file in output_files if output_file]
+        audio_infos = self.audio_processor.tag_and_probe(output_files, metadata)
 
-                # Show file info
-                audio_info = self.audio_processor.get_audio_info(output_file)
-                print(
-                    f"{Fore.CYAN}{os.path.basename(output_file)}: "
-                    f"{audio_info.get('duration_formatted', 'Unknown')} duration"
-                    f"{Style.RESET_ALL}"
-                )
+        for output_file, audio_info in zip(output_files, audio_infos):
+            # Show file info
+            print(
+                f"{_CYAN}{output_file.name}: " f"{audio_info.get('duration_formatted', 'Unknown')} duration" f"{_RESET}"
+            )
 
     def list_available_voices(self) -> None:
         """List available voices for current language."""
-        print(f"{Fore.BLUE}Available voices for {self.language}:{Style.RESET_ALL}")
+        print(f"{_BLUE}Available voices for {self.language}:{_RESET}")
 
         try:
             voices = self.tts_engine.list_available_voices()
@@ -265,57 +570,59 @@ class AudiobookGenerator:
                     voice_type = "Premium" if "Wavenet" in voice["name"] else "Standard"
                     print(f"  • {voice['name']} ({voice['gender']}) - {voice_type}")
             else:
-                print(f"{Fore.YELLOW}No voices found for language: {self.language}{Style.RESET_ALL}")
+                print(f"{_YELLOW}No voices found for language: {self.language}{_RESET}")
         except Exception as e:
-            print(f"{Fore.RED}Error retrieving voices: {e}{Style.RESET_ALL}")
+            print(f"{_RED}Error retrieving voices: {e}{_RESET}")
 
     def cleanup(self) -> None:
         """Clean up resources."""
+        if "audio_processor" not in self.__dict__:
+            return  # Never built, nothing to release
+
         try:
             self.audio_processor.cleanup()
         except Exception as e:
             logger.warning(f"Error during cleanup: {e}")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_tts_client() -> "texttospeech.TextToSpeechClient":
+    """Create the TTS client once; the credential exchange it performs is slow."""
+    from google.cloud import texttospeech
+
+    return texttospeech.TextToSpeechClient()
+
+
 def validate_credentials() -> bool:
     """Validate Google Cloud credentials."""
     creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 
     if not creds_path:
-        print(f"{Fore.RED}✗ GOOGLE_APPLICATION_CREDENTIALS environment variable not set{Style.RESET_ALL}")
-        print(f"{Fore.YELLOW}Please set up Google Cloud credentials first{Style.RESET_ALL}")
+        print(f"{_RED}✗ GOOGLE_APPLICATION_CREDENTIALS environment variable not set{_RESET}")
+        print(f"{_YELLOW}Please set up Google Cloud credentials first{_RESET}")
         print(
-            (
-                f"{Fore.CYAN}Example: export GOOGLE_APPLICATION_CREDENTIALS="
-                f"'/path/to/service-account-key.json'{Style.RESET_ALL}"
-            )
+            (f"{_CYAN}Example: export GOOGLE_APPLICATION_CREDENTIALS=" f"'/path/to/service-account-key.json'{_RESET}")
         )
         return False
 
     if not os.path.exists(creds_path):
-        print(f"{Fore.RED}✗ Credentials file not found: {creds_path}{Style.RESET_ALL}")
+        print(f"{_RED}✗ Credentials file not found: {creds_path}{_RESET}")
         return False
 
     try:
-        # Try to initialize a client to validate credentials
-        from google.cloud import texttospeech
-
-        texttospeech.TextToSpeechClient()
+        # Try to initialize a client to validate credentials, kept for the generator to reuse
+        _get_tts_client()
         return True
     except Exception as e:
-        print(f"{Fore.RED}✗ Invalid Google Cloud credentials: {e}{Style.RESET_ALL}")
+        print(f"{_RED}✗ Invalid Google Cloud credentials: {e}{_RESET}")
         return False
 
 
 def validate_language_code(language: str) -> bool:
     """Validate language code format."""
-    import re
-
-    # Basic validation for language codes like 'pt-BR', 'en-US', etc.
-    pattern = r"^[a-z]{2}(-[A-Z]{2})?$"
-    if not re.match(pattern, language):
-        print(f"{Fore.RED}✗ Invalid language code format: {language}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Expected format: 'pt-BR', 'en-US', 'fr-FR', etc.{Style.RESET_ALL}")
+    if not _LANG_RE.match(language):
+        print(f"{_RED}✗ Invalid language code format: {language}{_RESET}")
+        print(f"{_CYAN}Expected format: 'pt-BR', 'en-US', 'fr-FR', etc.{_RESET}")
         return False
     return True
 
@@ -325,7 +632,8 @@ def validate_language_code(language: str) -> bool:
 @click.version_option(version="0.1.0", prog_name="fast-sttext")
 def cli() -> None:
     """Fast-STText: Convert text files to audiobooks using Google Text-to-Speech."""
-    pass
+    # Initialize colorama for colored output
+    init()
 
 
 @cli.command()
@@ -346,8 +654,26 @@ def cli() -> None:
 )
 @click.option("--chapters/--no-chapters", default=False, help="Split output into chapter files")
 @click.option("--preview", is_flag=True, help="Generate preview with first 5 segments only")
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Write audio to disk as it is synthesized (lower memory, no normalization or fades, ignored with --chapters)",
+)
+@click.option("--resume", is_flag=True, help="Reuse audio synthesized by an interrupted run of this job")
+@click.option(
+    "--keep-parts", is_flag=True, help="Keep the job's synthesized audio parts after the audiobook is created"
+)
 def generate(
-    input_file: str, output: Optional[str], language: str, voice: str, premium: bool, chapters: bool, preview: bool
+    input_file: str,
+    output: Optional[str],
+    language: str,
+    voice: str,
+    premium: bool,
+    chapters: bool,
+    preview: bool,
+    stream: bool,
+    resume: bool,
+    keep_parts: bool,
 ) -> None:
     """Generate audiobook from input file."""
 
@@ -363,30 +689,29 @@ def generate(
 
     generator = None
     try:
-        print(f"{Fore.BLUE}🚀 Starting audiobook generation...{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Input: {input_file}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}Language: {language}, Voice: {voice}, Premium: {premium}{Style.RESET_ALL}")
+        print(_MSG_STARTING)
+        print(f"{_CYAN}Input: {input_file}{_RESET}")
+        print(f"{_CYAN}Language: {language}, Voice: {voice}, Premium: {premium}{_RESET}")
 
-        generator = AudiobookGenerator(language, voice, premium)
+        generator = AudiobookGenerator(language, voice, premium, tts_client=_get_tts_client())
 
-        output_files = generator.generate_audiobook(input_file, output, chapters, preview)
+        output_files = generator.generate_audiobook(input_file, output, chapters, preview, stream, resume, keep_parts)
 
         if output_files:
-            print(f"\n{Fore.GREEN}🎉 Audiobook generation completed!{Style.RESET_ALL}")
-            print(f"{Fore.CYAN}Generated files:{Style.RESET_ALL}")
+            print(f"\n{_GREEN}🎉 Audiobook generation completed!{_RESET}")
+            print(f"{_CYAN}Generated files:{_RESET}")
             for file in output_files:
                 if file:
-                    full_path = os.path.abspath(file)
-                    print(f"  📁 {full_path}")
+                    print(f"  📁 {file.absolute()}")
         else:
-            print(f"\n{Fore.RED}✗ Audiobook generation failed{Style.RESET_ALL}")
+            print(f"\n{_RED}✗ Audiobook generation failed{_RESET}")
             sys.exit(1)
 
     except KeyboardInterrupt:
-        print(f"\n{Fore.YELLOW}⚠️  Generation interrupted by user{Style.RESET_ALL}")
+        print(f"\n{_YELLOW}⚠️  Generation interrupted by user{_RESET}")
         sys.exit(1)
     except Exception as e:
-        print(f"\n{Fore.RED}💥 Error: {e}{Style.RESET_ALL}")
+        print(f"\n{_RED}💥 Error: {e}{_RESET}")
         logger.exception("Audiobook generation failed")
         sys.exit(1)
     finally:
@@ -406,10 +731,10 @@ def voices(language: str) -> None:
 
     generator = None
     try:
-        generator = AudiobookGenerator(language)
+        generator = AudiobookGenerator(language, tts_client=_get_tts_client())
         generator.list_available_voices()
     except Exception as e:
-        print(f"{Fore.RED}Error listing voices: {e}{Style.RESET_ALL}")
+        print(f"{_RED}Error listing voices: {e}{_RESET}")
         logger.exception("Failed to list voices")
         sys.exit(1)
     finally:
@@ -425,17 +750,17 @@ def files() -> None:
         input_files = file_handler.list_input_files()
 
         if input_files:
-            print(f"{Fore.BLUE}📁 Available input files:{Style.RESET_ALL}")
+            print(f"{_BLUE}📁 Available input files:{_RESET}")
             for file in input_files:
                 file_info = file_handler.get_file_info(file)
                 status = "✓" if file_info.get("is_supported", False) else "✗"
                 print(f"  {status} {file_info['name']} ({file_info['size_formatted']})")
         else:
-            print(f"{Fore.YELLOW}📂 No input files found in {Config.INPUT_DIR}{Style.RESET_ALL}")
+            print(f"{_YELLOW}📂 No input files found in {Config.INPUT_DIR}{_RESET}")
             supported_formats = ", ".join(Config.SUPPORTED_TEXT_FORMATS + Config.SUPPORTED_EBOOK_FORMATS)
-            print(f"{Fore.CYAN}Supported formats: {supported_formats}{Style.RESET_ALL}")
+            print(f"{_CYAN}Supported formats: {supported_formats}{_RESET}")
     except Exception as e:
-        print(f"{Fore.RED}Error listing files: {e}{Style.RESET_ALL}")
+        print(f"{_RED}Error listing files: {e}{_RESET}")
         logger.exception("Failed to list files")
         sys.exit(1)
 
@@ -447,9 +772,9 @@ def cleanup() -> None:
     try:
         file_handler = FileHandler()
         file_handler.cleanup_output_directory()
-        print(f"{Fore.GREEN}✓ Output directory cleaned up{Style.RESET_ALL}")
+        print(f"{_GREEN}✓ Output directory cleaned up{_RESET}")
     except Exception as e:
-        print(f"{Fore.RED}Error cleaning up: {e}{Style.RESET_ALL}")
+        print(f"{_RED}Error cleaning up: {e}{_RESET}")
         logger.exception("Failed to cleanup")
         sys.exit(1)
 
@@ -457,7 +782,7 @@ def cleanup() -> None:
 @cli.command()
 def config() -> None:
     """Show current configuration."""
-    print(f"{Fore.BLUE}⚙️  Current Configuration:{Style.RESET_ALL}")
+    print(f"{_BLUE}⚙️  Current Configuration:{_RESET}")
     print(f"  Input Directory: {Config.INPUT_DIR}")
     print(f"  Output Directory: {Config.OUTPUT_DIR}")
     print(f"  Default Language: {Config.DEFAULT_LANGUAGE_CODE}")
@@ -470,11 +795,11 @@ def config() -> None:
     if creds_path:
         print(f"  Google Credentials: {creds_path}")
         if os.path.exists(creds_path):
-            print(f"  {Fore.GREEN}✓ Credentials file exists{Style.RESET_ALL}")
+            print(f"  {_GREEN}✓ Credentials file exists{_RESET}")
         else:
-            print(f"  {Fore.RED}✗ Credentials file not found{Style.RESET_ALL}")
+            print(f"  {_RED}✗ Credentials file not found{_RESET}")
     else:
-        print(f"  {Fore.RED}✗ GOOGLE_APPLICATION_CREDENTIALS not set{Style.RESET_ALL}")
+        print(f"  {_RED}✗ GOOGLE_APPLICATION_CREDENTIALS not set{_RESET}")
 
 
 if __name__ == "__main__":
@@ -3,17 +3,131 @@ Text processing module for audiobook generation.
 Handles text segmentation, cleaning, and SSML generation.
 """
 
+import functools
 import re
-from dataclasses import dataclass
+from bisect import bisect_right
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import accumulate
 from typing import Dict, List, Tuple
 
 import nltk  # type: ignore
 from nltk.tokenize import PunktSentenceTokenizer  # type: ignore
 
+from config import Config
 
-@dataclass
+# Patterns are compiled once at import; they run over every paragraph and segment of a book
+
+# References without punctuation before: word + number + space + capital letter (but not years/dates)
+_REF_RE = re.compile(r"(\w)\s*(\d{1,2})\s+([A-Z])")
+
+# Common reference patterns like "bronze.8 Um" or "história".2 A"
+_REF_PUNCT_RE = re.compile(r"([a-záàâãéêíóôõúç])([.!?]?)(\d{1,2})\s+([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ])")
+
+# Punctuation spacing in one sweep: a mark followed by another mark ("?!" -> "? !", the second one also
+# spaced from a capital right after it) or by a capital (".A" -> ". A"). Same output as running the pair
+# fix and then the capital fix as two passes, since the pair fix never changes what follows its second mark.
+_PUNCT_RE = re.compile(r"([.!?])(?:\s*([.!?])(?=([A-Z])?)|([A-Z]))")
+
+# Abbreviations common in Portuguese
+_ABBREVIATIONS = {
+    "dr.": "doutor",
+    "dra.": "doutora",
+    "sr.": "senhor",
+    "sra.": "senhora",
+    "prof.": "professor",
+    "profa.": "professora",
+    "etc.": "et cetera",
+    "ex.": "exemplo",
+    "obs.": "observação",
+}
+# One pass for all abbreviations; anchored at a word start so e.g. "adr." or "index." are left alone
+_ABBR_RE = re.compile(r"\b(?:dr|dra|sr|sra|prof|profa|etc|ex|obs)\.", re.IGNORECASE)
+
+_NUMBER_RE = re.compile(r"\b(\d+)\b")
+_DIGIT_RE = re.compile(r"\d")  # Cheap pre-check, most sentences have no numbers
+
+# Chapter heading lines ("Capítulo 3", "Chapter IV: Title", "Parte ii", "12. Title"), found with one scan of
+# the whole text. Matches start at the newline before the heading, a literal prefix the regex engine can
+# search for quickly; [^\S\n] is whitespace other than a newline, so a match never spans two lines.
+_CHAPTER_RE = re.compile(r"\n[^\S\n]*(?:(?:capítulo|chapter|parte)[^\S\n]+(?:\d+|[ivx]+)|\d+\.).*", re.IGNORECASE)
+
+_SENTENCE_END_RE = re.compile(r"[.!?]+\s+")
+_SSML_PAUSE_RE = re.compile(r"([.!?])\s+")
+_SSML_PARA_RE = re.compile(r"\n\s*\n")
+
+
+def _space_punctuation(match: re.Match) -> str:
+    """Build the replacement for a _PUNCT_RE match."""
+    mark, second_mark, capital_after, capital = match.groups()
+    if capital:
+        return f"{mark} {capital}"
+    return f"{mark} {second_mark} " if capital_after else f"{mark} {second_mark}"
+
+
+def _normalize_text(text: str) -> str:
+    """Apply every clean_text step except number wrapping; safe to run before sentence splitting."""
+    # Remove excessive whitespace; str.split collapses runs of any whitespace without the regex engine
+    text = " ".join(text.split())
+
+    # Alternative pattern for references without punctuation before
+    text = _REF_RE.sub(
+        lambda m: (
+            m.group(1) + " " + m.group(3) if not m.group(2) in ["19", "20"] and len(m.group(2)) <= 2 else m.group(0)
+        ),
+        text,
+    )
+
+    # More specific pattern for common reference patterns
+    text = _REF_PUNCT_RE.sub(r"\1\2 \4", text)
+
+    # Fix common punctuation issues and add proper spacing after punctuation
+    text = _PUNCT_RE.sub(_space_punctuation, text)
+
+    # Handle abbreviations common in Portuguese
+    text = _ABBR_RE.sub(lambda m: _ABBREVIATIONS[m.group(0).lower()], text)
+
+    return text.strip()
+
+
+def _wrap_numbers(text: str) -> str:
+    """Mark numbers to be read as numbers."""
+    if not _DIGIT_RE.search(text):
+        return text
+    return _NUMBER_RE.sub(r'<say-as interpret-as="number">\1</say-as>', text)
+
+
+@functools.lru_cache(maxsize=1024)
+def _create_ssml_with_pauses(text: str) -> str:
+    """Create SSML markup with sentence and paragraph pauses; inputs are whole segments, so fewer are kept."""
+    # Wrap in SSML speak tags
+    ssml = f"<speak>{text}</speak>"
+
+    # Add pauses after sentences
+    ssml = _SSML_PAUSE_RE.sub(r'\1 <break time="0.8s"/> ', ssml)
+
+    # Add longer pauses for paragraph breaks; segment text is single-line, so usually there are none
+    if "\n" in ssml:
+        ssml = _SSML_PARA_RE.sub('<break time="1.5s"/>', ssml)
+
+    return ssml
+
+
+@functools.lru_cache(maxsize=8)
+def _get_punkt(language: str) -> PunktSentenceTokenizer:
+    """Get the sentence tokenizer for a language, shared by every TextProcessor."""
+    # Download required NLTK data; checked once per process rather than per TextProcessor
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        nltk.download("punkt")
+
+    return PunktSentenceTokenizer()
+
+
+@dataclass(slots=True)
 class TextSegment:
-    """Represents a segment of text with metadata."""
+    """Represents a segment of text with metadata; slotted, since a book produces thousands of them."""
 
     text: str
     segment_type: str  # 'sentence', 'paragraph', 'chapter'
@@ -22,6 +136,14 @@ class TextSegment:
     sentence_number: int = 0
 
 
+@dataclass
+class SegmentBatch:
+    """Segments produced from a text, with the number of segments in each chapter."""
+
+    segments: List[TextSegment]
+    chapter_counts: "Counter[int]" = field(default_factory=Counter)
+
+
 class TextProcessor:
     """Handles text processing and segmentation for audiobook generation."""
 
@@ -29,105 +151,31 @@ class TextProcessor:
         """Initialize text processor with language-specific settings."""
         self.language = language
 
-        # Download required NLTK data
-        try:
-            nltk.data.find("tokenizers/punkt")
-        except LookupError:
-            nltk.download("punkt")
-
         # Initialize the sentence tokenizer
-        self.sentence_tokenizer = PunktSentenceTokenizer()
+        self.sentence_tokenizer = _get_punkt(language)
 
     def clean_text(self, text: str) -> str:
         """Clean and normalize text for TTS processing."""
-        # Remove excessive whitespace
-        text = re.sub(r"\s+", " ", text)
-
-        # Alternative pattern for references without punctuation before
-        # Matches: word + number + space + capital letter (but not years/dates)
-        text = re.sub(
-            r"(\w)\s*(\d{1,2})\s+([A-Z])",
-            lambda m: (
-                m.group(1) + " " + m.group(3) if not m.group(2) in ["19", "20"] and len(m.group(2)) <= 2 else m.group(0)
-            ),
-            text,
-        )
-
-        # More specific pattern for common reference patterns
-        # Matches patterns like "bronze.8 Um" or "história".2 A"
-        text = re.sub(
-            r"([a-záàâãéêíóôõúç])([.!?]?)(\d{1,2})\s+([A-ZÁÀÂÃÉÊÍÓÔÕÚÇ])",
-            r"\1\2 \4",
-            text,
-        )
-
-        # Fix common punctuation issues
-        text = re.sub(r"([.!?])\s*([.!?])", r"\1 \2", text)
-
-        # Add proper spacing after punctuation
-        text = re.sub(r"([.!?])([A-Z])", r"\1 \2", text)
-
-        # Handle abbreviations common in Portuguese
-        abbreviations = {
-            "dr.": "doutor",
-            "dra.": "doutora",
-            "sr.": "senhor",
-            "sra.": "senhora",
-            "prof.": "professor",
-            "profa.": "professora",
-            "etc.": "et cetera",
-            "ex.": "exemplo",
-            "obs.": "observação",
-        }
-
-        for abbr, full in abbreviations.items():
-            text = re.sub(re.escape(abbr), full, text, flags=re.IGNORECASE)
-
-        # Handle numbers
-        text = re.sub(r"\b(\d+)\b", r'<say-as interpret-as="number">\1</say-as>', text)
-
-        return text.strip()
+        return _wrap_numbers(_normalize_text(text))
 
     def detect_chapters(self, text: str) -> List[Tuple[int, str]]:
         """Detect chapter boundaries in text."""
         chapters = []
-        chapter_patterns = [
-            r"^\s*capítulo\s+(\d+|[ivx]+)\s*:?\s*(.*)$",
-            r"^\s*chapter\s+(\d+|[ivx]+)\s*:?\s*(.*)$",
-            r"^\s*(\d+)\.\s*(.*)$",
-            r"^\s*parte\s+(\d+|[ivx]+)\s*:?\s*(.*)$",
-        ]
-
-        lines = text.split("\n")
-        current_chapter = 1
-        current_text = ""
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                current_text += "\n"
-                continue
-
-            is_chapter = False
-            for pattern in chapter_patterns:
-                match = re.match(pattern, line, re.IGNORECASE)
-                if match:
-                    # Save previous chapter if exists
-                    if current_text.strip():
-                        chapters.append((current_chapter, current_text.strip()))
-
-                    # Start new chapter
-                    current_chapter += 1
-                    current_text = ""
-                    is_chapter = True
-                    break
-
-            if not is_chapter:
-                current_text += line + "\n"
-
-        # Add the last chapter
-        if current_text.strip():
-            chapters.append((current_chapter, current_text.strip()))
+
+        # Chapters are the text between heading lines; each heading starts a new chapter number, even
+        # when the text before it is empty and no chapter is emitted for it
+        # A leading newline lets a heading on the first line match too; offsets are then shifted by one
+        body_start = 0
+        bodies = []
+        for match in _CHAPTER_RE.finditer("\n" + text):
+            bodies.append(text[body_start : match.start()])
+            body_start = match.end() - 1
+        bodies.append(text[body_start:])
+
+        for chapter_num, body in enumerate(bodies, 1):
+            chapter_text = "\n".join(line.strip() for line in body.split("\n")).strip()
+            if chapter_text:
+                chapters.append((chapter_num, chapter_text))
 
         # If no chapters detected, treat entire text as one chapter
         if not chapters:
@@ -138,28 +186,28 @@ class TextProcessor:
     def split_into_paragraphs(self, text: str) -> List[str]:
         """Split text into paragraphs."""
         paragraphs = []
-        current_paragraph = ""
+        current_paragraph: List[str] = []
 
         for line in text.split("\n"):
             line = line.strip()
             if not line:
                 if current_paragraph:
-                    paragraphs.append(current_paragraph.strip())
-                    current_paragraph = ""
+                    paragraphs.append(" ".join(current_paragraph))
+                    current_paragraph = []
             else:
-                current_paragraph += " " + line if current_paragraph else line
+                current_paragraph.append(line)
 
         if current_paragraph:
-            paragraphs.append(current_paragraph.strip())
+            paragraphs.append(" ".join(current_paragraph))
 
         return [p for p in paragraphs if p]
 
     def split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences using NLTK."""
         try:
-            # Use the tokenizer's tokenize method
-            sentences = self.sentence_tokenizer.tokenize(text)
-            return [s.strip() for s in sentences if s.strip()]
+            # Slice sentences from the tokenizer's spans and strip each one once
+            sentences = (text[start:end].strip() for start, end in self.sentence_tokenizer.span_tokenize(text))
+            return [s for s in sentences if s]
         except Exception as e:
             # Fallback to basic sentence splitting if NLTK fails
             print(f"NLTK tokenization failed: {e}, falling back to basic splitting")
@@ -168,74 +216,85 @@ class TextProcessor:
     def _basic_sentence_split(self, text: str) -> List[str]:
         """Fallback sentence splitting method."""
         # Simple sentence splitting on common sentence endings
-        sentences = re.split(r"[.!?]+\s+", text)
-        return [s.strip() for s in sentences if s.strip()]
+        sentences = _SENTENCE_END_RE.split(text)
+        return [stripped for s in sentences if (stripped := s.strip())]
 
     def create_segments(self, text: str, max_length: int = 4000) -> List[TextSegment]:
         """Create text segments suitable for TTS processing."""
+        return self.create_segment_batch(text, max_length).segments
+
+    def create_segment_batch(self, text: str, max_length: int = 4000) -> SegmentBatch:
+        """Create text segments suitable for TTS processing, counting segments per chapter as they are made."""
         segments = []
+        chapter_counts: Counter[int] = Counter()
         chapters = self.detect_chapters(text)
 
         for chapter_num, chapter_text in chapters:
             paragraphs = self.split_into_paragraphs(chapter_text)
 
             for para_num, paragraph in enumerate(paragraphs, 1):
-                sentences = self.split_into_sentences(paragraph)
-
-                # Group sentences into chunks that fit within max_length
-                current_chunk = ""
-                chunk_sentences: List[str] = []
-
-                for sent_num, sentence in enumerate(sentences, 1):
-                    cleaned_sentence = self.clean_text(sentence)
-
-                    # Check if adding this sentence would exceed max_length
-                    if len(current_chunk) + len(cleaned_sentence) + 1 > max_length and current_chunk:
-                        # Save current chunk
-                        segments.append(
-                            TextSegment(
-                                text=current_chunk.strip(),
-                                segment_type="paragraph",
-                                chapter_number=chapter_num,
-                                paragraph_number=para_num,
-                                sentence_number=len(chunk_sentences),
-                            )
-                        )
-
-                        # Start new chunk
-                        current_chunk = cleaned_sentence
-                        chunk_sentences = [sentence]
-                    else:
-                        current_chunk += " " + cleaned_sentence if current_chunk else cleaned_sentence
-                        chunk_sentences.append(sentence)
+                # Normalize the whole paragraph in one pass before splitting it. Numbers are wrapped per
+                # sentence, so the tokenizer never sees SSML tags
+                sentences = [
+                    _wrap_numbers(sentence) for sentence in self.split_into_sentences(_normalize_text(paragraph))
+                ]
+
+                # Greedily pack sentences into chunks that fit within max_length. Offsets are running
+                # totals of sentence lengths plus one separator each, so " ".join(sentences[start:end])
+                # is offsets[end] - offsets[start] - 1 characters long
+                offsets = [0, *accumulate(len(sentence) + 1 for sentence in sentences)]
+                start = 0
+                while start < len(sentences):
+                    # Furthest end that still fits, taking at least one sentence even if it is too long
+                    end = bisect_right(offsets, offsets[start] + max_length + 1, lo=start + 1) - 1
+                    end = max(end, start + 1)
 
-                # Add the last chunk
-                if current_chunk:
                     segments.append(
                         TextSegment(
-                            text=current_chunk.strip(),
+                            text=" ".join(sentences[start:end]),
                             segment_type="paragraph",
                             chapter_number=chapter_num,
                             paragraph_number=para_num,
-                            sentence_number=len(chunk_sentences),
+                            sentence_number=end - start,
                         )
                     )
+                    chapter_counts[chapter_num] += 1
+                    start = end
 
-        return segments
+        return SegmentBatch(segments, chapter_counts)
 
     def create_ssml(self, text: str, add_pauses: bool = True) -> str:
         """Create SSML markup for better speech synthesis."""
-        # Wrap in SSML speak tags
-        ssml = f"<speak>{text}</speak>"
+        if not add_pauses:
+            # Only the wrapper, cheaper to build than to hash for the cache
+            return f"<speak>{text}</speak>"
+        return _create_ssml_with_pauses(text)
 
-        if add_pauses:
-            # Add pauses after sentences
-            ssml = re.sub(r"([.!?])\s+", r'\1 <break time="0.8s"/> ', ssml)
+    def create_document_ssml(self, segments: List[TextSegment]) -> str:
+        """
+        Join segments into a single SSML document for long-form synthesis.
 
-            # Add longer pauses for paragraph breaks
-            ssml = re.sub(r"\n\s*\n", '<break time="1.5s"/>', ssml)
+        Args:
+            segments: Text segments in reading order
 
-        return ssml
+        Returns:
+            SSML with the same sentence and chapter pauses the audio assembly inserts
+        """
+        parts: List[str] = []
+        current_chapter = None
+
+        for segment in segments:
+            if parts:
+                pause_ms = Config.PAUSE_BETWEEN_SENTENCES
+                if segment.chapter_number != current_chapter:
+                    pause_ms += Config.PAUSE_BETWEEN_CHAPTERS + Config.PAUSE_BETWEEN_SENTENCES
+                parts.append(f'<break time="{pause_ms}ms"/>')
+            current_chapter = segment.chapter_number
+
+            # Strip the per-segment <speak> wrapper
+            parts.append(self.create_ssml(segment.text)[len("<speak>") : -len("</speak>")])
+
+        return f"<speak>{''.join(parts)}</speak>"
 
     def get_segment_info(self, segment: TextSegment) -> Dict:
         """Get metadata information for a segment."""
@@ -247,3 +306,15 @@ class TextProcessor:
             "length": len(segment.text),
             "word_count": len(segment.text.split()),
         }
+
+    def batch_segment_info(self, segments: List[TextSegment]) -> List[Dict]:
+        """
+        Get metadata information for many segments at once.
+
+        Args:
+            segments: Text segments in reading order
+
+        Returns:
+            One get_segment_info dict per segment, in the same order
+        """
+        return [self.get_segment_info(segment) for segment in segments]
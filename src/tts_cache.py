@@ -0,0 +1,189 @@
+"""
+Persistent on-disk cache for synthesized speech.
+Stores MP3 bytes keyed by the synthesis request so re-runs skip the TTS API.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TTSCache:
+    """Content-addressed MP3 cache with least-recently-used eviction."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_mb: Optional[int] = None) -> None:
+        """
+        Initialize TTS cache.
+
+        Args:
+            cache_dir: Cache directory, defaults to Config.TTS_CACHE_DIR under Config.OUTPUT_DIR
+            max_mb: Size limit in megabytes, defaults to Config.TTS_CACHE_MB
+        """
+        self.cache_dir = cache_dir or os.path.join(Config.OUTPUT_DIR, Config.TTS_CACHE_DIR)
+        self.max_bytes = (max_mb if max_mb is not None else Config.TTS_CACHE_MB) * 1024 * 1024
+
+    @staticmethod
+    def make_key(
+        text: str,
+        language: str,
+        voice_gender: str,
+        voice_name: Optional[str],
+        speaking_rate: float,
+        pitch: float,
+        volume_gain_db: float,
+        use_ssml: bool,
+    ) -> str:
+        """
+        Build the cache key for a synthesis request.
+
+        Args:
+            text: Text or SSML exactly as sent to the API
+            language: Language code
+            voice_gender: Voice gender
+            voice_name: Voice name, None for the API default
+            speaking_rate: Speaking rate
+            pitch: Pitch
+            volume_gain_db: Volume gain
+            use_ssml: Whether the text contains SSML markup
+
+        Returns:
+            Hex digest of everything that affects the synthesized audio
+        """
+        key_source = json.dumps(
+            [language, voice_gender, voice_name, speaking_rate, pitch, volume_gain_db, use_ssml, text]
+        )
+        return hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Get the file path for a cache key."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def contains(self, key: str) -> bool:
+        """Check whether audio is cached for a key without reading it."""
+        return os.path.exists(self._path(key))
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Load cached audio.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Audio content as bytes, or None on a cache miss
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio_bytes = f.read()
+        except OSError:
+            return None
+
+        # Refresh the access time explicitly, since relatime/noatime mounts may not
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return audio_bytes or None
+
+    def put(self, key: str, audio_bytes: bytes) -> None:
+        """
+        Store audio in the cache. Empty audio is not cached.
+
+        Args:
+            key: Cache key from make_key
+            audio_bytes: Audio content as bytes
+        """
+        if not audio_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, "wb") as f:
+                f.write(audio_bytes)
+            # Atomic rename, so readers never see a partial file
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write TTS cache entry {key}: {e}")
+
+    def _scan(self) -> List["os.DirEntry[str]"]:
+        """List the cached MP3 files, skipping temporary files of unfinished writes."""
+        files: List["os.DirEntry[str]"] = []
+        try:
+            with os.scandir(self.cache_dir) as buckets:
+                for bucket in buckets:
+                    if not bucket.is_dir():
+                        continue
+                    with os.scandir(bucket.path) as entries:
+                        files.extend(entry for entry in entries if entry.is_file() and entry.name.endswith(".mp3"))
+        except FileNotFoundError:
+            pass
+        return files
+
+    def merge_into(self, other: "TTSCache", keep: bool = False) -> int:
+        """
+        Transfer every entry into another cache.
+
+        Args:
+            other: Destination cache
+            keep: Copy the entries instead of moving them
+
+        Returns:
+            Number of entries transferred
+        """
+        transferred = 0
+        for entry in self._scan():
+            key = entry.name.removesuffix(".mp3")
+            if not keep:
+                path = other._path(key)
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(entry.path, path)
+                    transferred += 1
+                    continue
+                except OSError:
+                    pass  # Across filesystems, copy instead
+
+            audio_bytes = self.get(key)
+            if audio_bytes:
+                other.put(key, audio_bytes)
+                transferred += 1
+
+        return transferred
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits within its size limit."""
+        entries: List[Tuple[float, int, str]] = []
+        total_size = 0
+
+        for entry in self._scan():
+            stat = entry.stat()
+            entries.append((stat.st_atime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        if total_size <= self.max_bytes:
+            return
+
+        # Oldest access first
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to evict TTS cache entry {path}: {e}")
+
+        logger.info(f"Evicted {removed} TTS cache entries")
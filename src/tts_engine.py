@@ -1,17 +1,22 @@
+import json
 import logging
 import os
+import random
 import time
-from typing import Callable, Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from google.api_core import exceptions
 from google.cloud import texttospeech
 
 from config import Config
-from text_processor import TextSegment
+from text_processor import TextProcessor, TextSegment
+from tts_cache import TTSCache
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+
+# Voice catalogs keyed by language code, shared by all engines for the life of the process
+_VOICES_CACHE: Dict[str, List[Dict]] = {}
 
 
 class TTSEngine:
@@ -22,6 +27,7 @@ class TTSEngine:
         language_code: Optional[str] = None,
         voice_gender: Optional[str] = None,
         use_premium_voices: bool = True,
+        client: Optional[texttospeech.TextToSpeechClient] = None,
     ):
         """
         Initialize TTS engine.
@@ -30,46 +36,101 @@ class TTSEngine:
             language_code: Language code (e.g., "pt-BR", "en-US")
             voice_gender: Voice gender (MALE, FEMALE, NEUTRAL)
             use_premium_voices: Whether to use premium Wavenet voices
+            client: Already constructed TTS client to reuse instead of creating one
         """
         self.language_code = language_code or Config.DEFAULT_LANGUAGE_CODE
         self.voice_gender = voice_gender or Config.DEFAULT_VOICE_GENDER
         self.use_premium_voices = use_premium_voices
 
         # Initialize client
-        try:
-            self.client = texttospeech.TextToSpeechClient()
-            logger.info("TTS client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize TTS client: {e}")
-            raise
+        if client is not None:
+            self.client = client
+        else:
+            try:
+                self.client = texttospeech.TextToSpeechClient()
+                logger.info("TTS client initialized successfully")
+            except Exception as e:
+                logger.error(f"Failed to initialize TTS client: {e}")
+                raise
 
         # Get voice configuration
         self.voice_name = Config.get_voice_name(self.language_code, self.voice_gender, self.use_premium_voices)
 
+        # Request parameters that are the same for every segment, built once
+        self._voice = self._voice_selection()
+        self._default_audio_params = (
+            Config.DEFAULT_SPEAKING_RATE,
+            Config.DEFAULT_PITCH,
+            Config.DEFAULT_VOLUME_GAIN_DB,
+        )
+        self._default_audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.MP3,
+            speaking_rate=Config.DEFAULT_SPEAKING_RATE,
+            pitch=Config.DEFAULT_PITCH,
+            volume_gain_db=Config.DEFAULT_VOLUME_GAIN_DB,
+        )
+
+        # SSML builder shared by every synthesis call
+        self._text_processor = TextProcessor()
+
         logger.info(f"Using voice: {self.voice_name or 'default'}")
 
     def list_available_voices(self) -> List[Dict]:
         """List all available voices for the current language."""
         try:
-            voices = self.client.list_voices()
-            available_voices = []
-
-            for voice in voices.voices:
-                if self.language_code in voice.language_codes:
-                    available_voices.append(
-                        {
-                            "name": voice.name,
-                            "gender": voice.ssml_gender.name,
-                            "language_codes": list(voice.language_codes),
-                            "natural_sample_rate": voice.natural_sample_rate_hertz,
-                        }
-                    )
-
-            return available_voices
+            return [dict(voice) for voice in self._list_voices_raw(self.language_code)]
         except Exception as e:
             logger.error(f"Failed to list voices: {e}")
             return []
 
+    def _list_voices_raw(self, language_code: str) -> List[Dict]:
+        """
+        Get the voice catalog for a language, from memory, or from disk if fetched within Config.VOICE_CACHE_TTL_SEC.
+
+        Args:
+            language_code: Language code (e.g., "pt-BR", "en-US")
+
+        Returns:
+            Voice descriptions; shared by cached calls, so callers must copy before modifying
+        """
+        cached_voices = _VOICES_CACHE.get(language_code)
+        if cached_voices is not None:
+            return cached_voices
+
+        cache_path = os.path.join(Config.VOICE_CACHE_DIR, f"voices_{language_code}.json")
+        try:
+            if os.path.getmtime(cache_path) > time.time() - Config.VOICE_CACHE_TTL_SEC:
+                with open(cache_path, encoding="utf-8") as f:
+                    disk_voices: List[Dict] = json.load(f)
+                _VOICES_CACHE[language_code] = disk_voices
+                return disk_voices
+        except (OSError, ValueError):
+            pass  # Missing, unreadable or corrupt cache, fetch again
+
+        voices = self.client.list_voices(language_code=language_code)
+        available_voices = []
+
+        for voice in voices.voices:
+            if language_code in voice.language_codes:
+                available_voices.append(
+                    {
+                        "name": voice.name,
+                        "gender": voice.ssml_gender.name,
+                        "language_codes": list(voice.language_codes),
+                        "natural_sample_rate": voice.natural_sample_rate_hertz,
+                    }
+                )
+
+        try:
+            os.makedirs(Config.VOICE_CACHE_DIR, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(available_voices, f)
+        except OSError as e:
+            logger.warning(f"Failed to write voice cache {cache_path}: {e}")
+
+        _VOICES_CACHE[language_code] = available_voices
+        return available_voices
+
     def synthesize_text(
         self,
         text: str,
@@ -94,24 +155,37 @@ class TTSEngine:
             Audio content as bytes
         """
         try:
-            # Prepare synthesis input
-            if use_ssml:
-                synthesis_input = texttospeech.SynthesisInput(ssml=text)
-            else:
-                synthesis_input = texttospeech.SynthesisInput(text=text)
+            audio_content = self._request_speech(text, use_ssml, speaking_rate, pitch, volume_gain_db)
 
-            # Voice selection
-            voice_params = {
-                "language_code": self.language_code,
-                "ssml_gender": getattr(texttospeech.SsmlVoiceGender, self.voice_gender),
-            }
+            # Save to file if requested
+            if output_filename:
+                with open(output_filename, "wb") as out:
+                    out.write(audio_content)
+                logger.info(f'Audio saved to "{output_filename}"')
 
-            if self.voice_name:
-                voice_params["name"] = self.voice_name
+            return audio_content
 
-            voice = texttospeech.VoiceSelectionParams(**voice_params)
+        except exceptions.GoogleAPIError as e:
+            logger.error(f"Google API error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Synthesis error: {e}")
+            raise
 
-            # Audio configuration
+    def _request_speech(
+        self, text: str, use_ssml: bool, speaking_rate: float, pitch: float, volume_gain_db: float
+    ) -> bytes:
+        """Call the synthesis API, backing off while concurrent requests are over the quota."""
+        # Prepare synthesis input
+        if use_ssml:
+            synthesis_input = texttospeech.SynthesisInput(ssml=text)
+        else:
+            synthesis_input = texttospeech.SynthesisInput(text=text)
+
+        # Audio configuration; segments use the defaults, so that one is prebuilt
+        if (speaking_rate, pitch, volume_gain_db) == self._default_audio_params:
+            audio_config = self._default_audio_config
+        else:
             audio_config = texttospeech.AudioConfig(
                 audio_encoding=texttospeech.AudioEncoding.MP3,
                 speaking_rate=speaking_rate,
@@ -119,31 +193,108 @@ class TTSEngine:
                 volume_gain_db=volume_gain_db,
             )
 
-            # Perform synthesis
-            response = self.client.synthesize_speech(input=synthesis_input, voice=voice, audio_config=audio_config)
+        for attempt in range(Config.TTS_QUOTA_RETRIES + 1):
+            try:
+                response = self.client.synthesize_speech(
+                    input=synthesis_input, voice=self._voice, audio_config=audio_config
+                )
+                break
+            except exceptions.ResourceExhausted:
+                if attempt == Config.TTS_QUOTA_RETRIES:
+                    raise
+                # Jitter keeps parallel workers from retrying in lockstep
+                delay = Config.TTS_QUOTA_BACKOFF_SEC * 2**attempt * random.uniform(1.0, 1.5)
+                logger.warning(f"TTS quota exhausted, retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        return response.audio_content
+
+    def _voice_selection(self) -> texttospeech.VoiceSelectionParams:
+        """Build the voice selection parameters for the configured voice."""
+        voice_params = {
+            "language_code": self.language_code,
+            "ssml_gender": getattr(texttospeech.SsmlVoiceGender, self.voice_gender),
+        }
+
+        if self.voice_name:
+            voice_params["name"] = self.voice_name
+
+        return texttospeech.VoiceSelectionParams(**voice_params)
+
+    def synthesize_long_audio(
+        self, ssml: str, output_gcs_uri: str, progress_callback: Optional[Callable[[float], None]] = None
+    ) -> bytes:
+        """
+        Synthesize a whole document with one SynthesizeLongAudio operation.
 
-            # Save to file if requested
-            if output_filename:
-                with open(output_filename, "wb") as out:
-                    out.write(response.audio_content)
-                logger.info(f'Audio saved to "{output_filename}"')
+        Args:
+            ssml: SSML document to synthesize
+            output_gcs_uri: gs://bucket/object path the operation writes to
+            progress_callback: Called with the operation's progress percentage while polling
+
+        Returns:
+            WAV (LINEAR16) audio content as bytes, the only encoding the long audio API produces
+        """
+        try:
+            import google.auth
+            from google.cloud import storage  # type: ignore
+        except ImportError:
+            logger.error("google-cloud-storage not installed. Install with: pip install google-cloud-storage")
+            raise
+
+        _, project_id = google.auth.default()
+        client = texttospeech.TextToSpeechLongAudioSynthesizeClient()
+        request = texttospeech.SynthesizeLongAudioRequest(
+            parent=f"projects/{project_id}/locations/{Config.LONG_AUDIO_LOCATION}",
+            input=texttospeech.SynthesisInput(ssml=ssml),
+            audio_config=texttospeech.AudioConfig(
+                audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+                speaking_rate=Config.DEFAULT_SPEAKING_RATE,
+                pitch=Config.DEFAULT_PITCH,
+                volume_gain_db=Config.DEFAULT_VOLUME_GAIN_DB,
+            ),
+            voice=self._voice,
+            output_gcs_uri=output_gcs_uri,
+        )
+
+        try:
+            operation = client.synthesize_long_audio(request=request)
+            logger.info(f"Long audio synthesis started, writing to {output_gcs_uri}")
 
-            return response.audio_content
+            while not operation.done():
+                time.sleep(Config.LONG_AUDIO_POLL_SEC)
+                if progress_callback and operation.metadata is not None:
+                    progress_callback(operation.metadata.progress_percentage)
+
+            operation.result()  # Raises if the operation failed
+
+            bucket_name, blob_name = output_gcs_uri.removeprefix("gs://").split("/", 1)
+            blob = storage.Client().bucket(bucket_name).blob(blob_name)
+            try:
+                audio_content: bytes = blob.download_as_bytes()
+            finally:
+                # Every run writes a new object, so remove it instead of letting the bucket grow
+                try:
+                    blob.delete()
+                except exceptions.GoogleAPIError as e:
+                    logger.warning(f"Failed to delete {output_gcs_uri}: {e}")
+            return audio_content
 
         except exceptions.GoogleAPIError as e:
             logger.error(f"Google API error: {e}")
             raise
-        except Exception as e:
-            logger.error(f"Synthesis error: {e}")
-            raise
 
-    def synthesize_segment(self, segment: TextSegment, output_dir: Optional[str] = None) -> bytes:
+    def synthesize_segment(
+        self, segment: TextSegment, output_dir: Optional[str] = None, add_pauses: bool = True
+    ) -> bytes:
         """
         Synthesize a text segment with appropriate settings.
 
         Args:
             segment: TextSegment to synthesize
             output_dir: Output directory for temporary files
+            add_pauses: Insert SSML breaks after sentences and paragraphs; prose whose punctuation
+                already paces the speech can skip them
 
         Returns:
             Audio content as bytes
@@ -157,10 +308,7 @@ class TTSEngine:
             )
 
         # Use SSML for better speech control
-        from text_processor import TextProcessor
-
-        processor = TextProcessor()
-        ssml_text = processor.create_ssml(segment.text)
+        ssml_text = self._text_processor.create_ssml(segment.text, add_pauses)
 
         return self.synthesize_text(
             ssml_text,
@@ -171,11 +319,33 @@ class TTSEngine:
             volume_gain_db=Config.DEFAULT_VOLUME_GAIN_DB,
         )
 
+    def cache_key(self, segment: TextSegment, add_pauses: bool = True) -> str:
+        """
+        Build the TTSCache key for the request synthesize_segment sends for a segment.
+
+        Args:
+            segment: TextSegment to synthesize
+            add_pauses: Same as for synthesize_segment
+
+        Returns:
+            Cache key covering the voice, audio settings and SSML
+        """
+        return TTSCache.make_key(
+            self._text_processor.create_ssml(segment.text, add_pauses),
+            self.language_code,
+            self.voice_gender,
+            self.voice_name,
+            *self._default_audio_params,
+            use_ssml=True,
+        )
+
     def batch_synthesize(
         self,
         segments: List[TextSegment],
         output_dir: Optional[str] = None,
         progress_callback: Optional[Callable] = None,
+        *,
+        concurrency: Optional[int] = None,
     ) -> List[bytes]:
         """
         Synthesize multiple text segments in batch.
@@ -183,28 +353,66 @@ class TTSEngine:
         Args:
             segments: List of TextSegment objects
             output_dir: Output directory for temporary files
-            progress_callback: Callback function for progress updates
+            progress_callback: Callback function for progress updates, called with (completed, total, segment)
+                for each successful segment in completion order
+            concurrency: Maximum requests in flight, defaults to Config.TTS_MAX_CONCURRENCY
 
         Returns:
-            List of audio content bytes
+            List of audio content bytes, in segment order, with empty bytes for failures
         """
-        audio_segments = []
+        audio_segments: List[bytes] = [b""] * len(segments)
+        completed = 0
 
-        for i, segment in enumerate(segments):
-            try:
-                audio_content = self.synthesize_segment(segment, output_dir)
-                audio_segments.append(audio_content)
+        for i, audio_content in self.stream_synthesize(segments, output_dir, concurrency):
+            audio_segments[i] = audio_content
 
-                if progress_callback:
-                    progress_callback(i + 1, len(segments), segment)
-
-            except Exception as e:
-                logger.error(f"Failed to synthesize segment {i}: {e}")
-                # Add silence as fallback
-                audio_segments.append(b"")
+            if audio_content and progress_callback:
+                completed += 1
+                progress_callback(completed, len(segments), segments[i])
 
         return audio_segments
 
+    def stream_synthesize(
+        self,
+        segments: List[TextSegment],
+        output_dir: Optional[str] = None,
+        concurrency: Optional[int] = None,
+    ) -> Iterator[Tuple[int, bytes]]:
+        """
+        Synthesize segments concurrently, yielding each result as soon as it is ready.
+
+        Nothing is accumulated, and at most `concurrency` requests are in flight,
+        so memory stays bounded by the consumer.
+
+        Args:
+            segments: List of TextSegment objects
+            output_dir: Output directory for temporary files
+            concurrency: Maximum requests in flight, defaults to Config.TTS_MAX_CONCURRENCY
+
+        Yields:
+            Tuples of (segment index, audio content bytes) in completion order, with empty bytes for failures
+        """
+        concurrency = concurrency or Config.TTS_MAX_CONCURRENCY
+        in_flight: Dict[Future, int] = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while next_index < len(segments) or in_flight:
+                while next_index < len(segments) and len(in_flight) < concurrency:
+                    future = executor.submit(self.synthesize_segment, segments[next_index], output_dir)
+                    in_flight[future] = next_index
+                    next_index += 1
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i = in_flight.pop(future)
+                    try:
+                        audio_content = future.result()
+                    except Exception as e:
+                        logger.error(f"Failed to synthesize segment {i}: {e}")
+                        audio_content = b""
+                    yield i, audio_content
+
 
 # Legacy function for backward compatibility
 def synthesize_text(
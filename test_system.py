@@ -2,6 +2,7 @@
 """
 Test script to verify basic functionality of the audiobook generator.
 """
+
 import os
 import sys
 import tempfile
@@ -69,6 +70,19 @@ def test_file_operations() -> bool:
                 print("File reading failed")
                 return False
 
+            # Test a legacy Windows-encoded Portuguese file
+            legacy_file = os.path.join(temp_dir, "legacy.txt")
+            legacy_content = "Introdução: Não há três “opções” às pressas — só uma."
+
+            with open(legacy_file, "w", encoding="cp1252") as f:
+                f.write(legacy_content)
+
+            if handler.read_file(legacy_file) == legacy_content:
+                print("Legacy encoding detection works correctly")
+            else:
+                print("Legacy encoding detection failed")
+                return False
+
             # Test file info
             info = handler.get_file_info(test_file)
             if info and info["name"] == "test.txt":
@@ -98,7 +112,7 @@ def test_text_processing() -> bool:
         test_text = "  Este é um  texto   com espaços   extras.  "
         cleaned = processor.clean_text(test_text)
 
-        if "espaços extras" in cleaned:
+        if cleaned == "Este é um texto com espaços extras.":
             print("Text cleaning works correctly")
         else:
             print("Text cleaning failed")
@@ -138,6 +152,156 @@ def test_text_processing() -> bool:
         return False
 
 
+def test_audio_processing() -> bool:
+    """Test audio concatenation."""
+    print("\nTesting audio processing...")
+
+    try:
+        from pydub.generators import Sine
+
+        from src.audio_processor import AudioProcessor
+        from src.config import Config
+
+        processor = AudioProcessor()
+        tone = Sine(440).to_audio_segment(duration=500).set_frame_rate(24000)
+
+        # Test concatenation with pauses
+        audio = processor.concatenate_audio_segments([tone, tone, tone])
+        expected = 3 * 500 + 2 * Config.PAUSE_BETWEEN_SENTENCES
+        if len(audio) == expected and audio.frame_rate == 24000:
+            print("Audio concatenation works correctly")
+        else:
+            print(f"Audio concatenation failed ({len(audio)} ms, expected {expected} ms)")
+            return False
+
+        # Test normalization
+        normalized = processor.normalize_audio(tone.apply_gain(-12), target_dBFS=-20.0)
+        if abs(normalized.dBFS + 20.0) < 0.1:
+            print("Audio normalization works correctly")
+        else:
+            print(f"Audio normalization failed ({normalized.dBFS:.2f} dBFS)")
+            return False
+
+        # Test fades
+        faded = processor.add_fade(audio, fade_in_ms=100, fade_out_ms=100)
+        samples = faded.get_array_of_samples()
+        if len(faded) == len(audio) and samples[0] == 0 and samples[-1] == 0:
+            print("Audio fades work correctly")
+        else:
+            print("Audio fades failed")
+            return False
+
+        print("Audio processing successful")
+        return True
+
+    except Exception as e:
+        print(f"Audio processing failed: {e}")
+        return False
+
+
+def test_streaming_writer() -> bool:
+    """Test streaming MP3 segments straight to disk."""
+    print("\nTesting streaming writer...")
+
+    try:
+        import io
+        from pathlib import Path
+
+        from mutagen.mp3 import MP3
+        from pydub import AudioSegment
+        from pydub.generators import Sine
+
+        from src.audio_processor import AudioProcessor, StreamingMP3Writer
+        from src.config import Config
+
+        processor = AudioProcessor()
+        segments = []
+        for freq, tags in ((440, None), (550, {"title": "Segment"})):
+            # Encoded like API output: a Xing/Info frame first, the second one behind an ID3v2 tag
+            buffer = io.BytesIO()
+            tone = Sine(freq).to_audio_segment(duration=1500).set_frame_rate(24000)
+            tone.export(buffer, format="mp3", bitrate="32k", tags=tags)
+            segments.append(buffer.getvalue())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            writer = StreamingMP3Writer(processor, Path(temp_dir) / "stream.mp3")
+            writer.append(1, segments[1], {"chapter": 1})  # Arrives first, held until segment 0
+            writer.append(0, segments[0], {"chapter": 1})
+            output_path = writer.close()
+
+            reported = MP3(str(output_path)).info.length
+            decoded = len(AudioSegment.from_mp3(str(output_path))) / 1000
+            expected = (2 * 1500 + Config.PAUSE_BETWEEN_SENTENCES) / 1000
+
+        if abs(reported - decoded) < 0.1 and abs(decoded - expected) < 0.2:
+            print("Streaming writer works correctly")
+        else:
+            print(
+                f"Streaming writer failed ({reported:.2f}s reported, {decoded:.2f}s decoded, {expected:.2f}s expected)"
+            )
+            return False
+
+        processor.cleanup()
+        print("Streaming writer successful")
+        return True
+
+    except Exception as e:
+        print(f"Streaming writer failed: {e}")
+        return False
+
+
+def test_tts_cache() -> bool:
+    """Test the on-disk TTS cache."""
+    print("\nTesting TTS cache...")
+
+    try:
+        from src.tts_cache import TTSCache
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = TTSCache(temp_dir)
+            keys = [
+                TTSCache.make_key(f"<speak>Frase {i}.</speak>", "pt-BR", "FEMALE", None, 1.0, 0.0, 0.0, True)
+                for i in range(3)
+            ]
+
+            # Test put/get round trip
+            cache.put(keys[0], b"\xff" * 100)
+            if cache.get(keys[0]) == b"\xff" * 100 and cache.get(keys[1]) is None:
+                print("Cache round trip works correctly")
+            else:
+                print("Cache round trip failed")
+                return False
+
+            # Test eviction of the least recently used entry once over the limit
+            cache.put(keys[1], b"\xff" * 100)
+            cache.put(keys[2], b"\xff" * 100)
+            for age, key in enumerate(keys):
+                os.utime(cache._path(key), (1_000_000 + age, 1_000_000 + age))
+            cache.max_bytes = 250
+            cache.evict()
+            if not cache.contains(keys[0]) and cache.contains(keys[1]) and cache.contains(keys[2]):
+                print("Cache eviction works correctly")
+            else:
+                print("Cache eviction failed")
+                return False
+
+            # Test that a write interrupted before its rename is never a hit
+            with open(f"{cache._path(keys[0])}.12345.tmp", "wb") as f:
+                f.write(b"\xff" * 10)
+            if cache.get(keys[0]) is None and not cache.contains(keys[0]):
+                print("Cache ignores partial writes correctly")
+            else:
+                print("Cache partial write handling failed")
+                return False
+
+        print("TTS cache successful")
+        return True
+
+    except Exception as e:
+        print(f"TTS cache failed: {e}")
+        return False
+
+
 def test_configuration() -> bool:
     """Test configuration settings."""
     print("\nTesting configuration...")
@@ -197,6 +361,9 @@ def main() -> None:
         test_imports,
         test_file_operations,
         test_text_processing,
+        test_audio_processing,
+        test_streaming_writer,
+        test_tts_cache,
         test_configuration,
         test_google_credentials,
         test_chunk_sizes,